@@ -0,0 +1,67 @@
+"""
+Token authentication backed by Django's cache.
+
+The user behind a token is cached for AUTH_TOKEN_CACHE_TIMEOUT seconds as
+the raw values of its concrete fields, so authenticated requests usually do
+no database work. Cached entries are dropped when the token is deleted
+(logout) and whenever the user is saved, e.g. after a role or organization
+change (see signals.py).
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.fields.files import FieldFile
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+# The password hash is never cached; it is loaded on access if ever needed
+_EXCLUDED_FIELDS = ('password',)
+
+
+def _cache_key(key):
+    return f'accounts:token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def _cached_value(user, name):
+    value = getattr(user, name)
+    return value.name if isinstance(value, FieldFile) else value
+
+
+def _cached_field_names():
+    return [
+        field.attname for field in get_user_model()._meta.concrete_fields
+        if field.attname not in _EXCLUDED_FIELDS
+    ]
+
+
+def invalidate_token(key):
+    cache.delete(_cache_key(key))
+
+
+def invalidate_user_tokens(user_id):
+    keys = Token.objects.filter(user_id=user_id).values_list('key', flat=True)
+    cache.delete_many([_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        cache_key = _cache_key(key)
+        values = cache.get(cache_key)
+        if values is None:
+            user, token = super().authenticate_credentials(key)
+            field_names = _cached_field_names()
+            cache.set(
+                cache_key,
+                [_cached_value(user, name) for name in field_names],
+                settings.AUTH_TOKEN_CACHE_TIMEOUT
+            )
+            return user, token
+
+        user_model = get_user_model()
+        user = user_model.from_db('default', _cached_field_names(), values)
+        if not user.is_active:
+            raise AuthenticationFailed('User inactive or deleted.')
+        return user, Token(key=key, user=user)
@@ -1,34 +1,28 @@
-import requests
+import time
 from typing import Dict, List, Optional
 from urllib.parse import urljoin
-from datetime import datetime, timedelta
+from datetime import timedelta
+from informatica_services.transport import SessionClient
 
-class InformaticaCloudAPI:
+class InformaticaCloudAPI(SessionClient):
     def __init__(self, pod_url: str, username: str, password: str, security_domain: Optional[str] = None):
         self.pod_url = pod_url.rstrip('/')
-        self.username = username
-        self.password = password
-        self.security_domain = security_domain
-        self.session_id = None
-        self.session_expiry = None
-        self.icSessionId = None
+        super().__init__(self.pod_url, username, password, security_domain)
 
-    def _get_auth_headers(self):
-        """Get authentication headers with session ID if available"""
-        if not self.session_id or datetime.now() >= self.session_expiry:
-            self._login()
-        
+    def _get_auth_headers(self, token: Optional[Dict] = None) -> Dict:
+        """Get authentication headers, including the Informatica Cloud session cookie"""
+        token = token or self._get_session_token()
         return {
-            'Content-Type': 'application/json',
-            'INFA-SESSION-ID': self.session_id,
+            **super()._get_auth_headers(token),
             'Accept': 'application/json',
-            'icSessionId': self.icSessionId
+            'icSessionId': token.get('ic_session_id')
         }
 
-    def _login(self):
-        """Login to Informatica API and get session ID"""
+    def _login(self) -> Dict:
+        """Login to Informatica API and return the new session"""
         login_url = f"{self.pod_url}/api/v2/user/login"
-        response = requests.post(
+        response = self._request(
+            'POST',
             login_url,
             json={
                 "username": self.username,
@@ -36,17 +30,18 @@ class InformaticaCloudAPI:
                 "securityDomain": self.security_domain or "@"
             }
         )
-        response.raise_for_status()
         data = response.json()
-        self.session_id = data['sessionId']
-        # Set session expiry to 23 hours from now (sessions typically last 24 hours)
-        self.session_expiry = datetime.now() + timedelta(hours=23)
-        self.icSessionId = response.cookies.get('icSessionId')
+        # Sessions typically last 24 hours; treat them as valid for 23
+        return {
+            'session_id': data['sessionId'],
+            'expires_at': time.time() + timedelta(hours=23).total_seconds(),
+            'ic_session_id': response.cookies.get('icSessionId')
+        }
 
     def test_connection(self) -> bool:
-        """Test connection to Informatica Cloud"""
+        """Test connection to Informatica Cloud, reusing a cached session if there is one"""
         try:
-            self._login()
+            self._get_auth_headers()
             return True
         except Exception as e:
             print(f"Connection test failed: {str(e)}")
@@ -55,11 +50,7 @@ class InformaticaCloudAPI:
     def get_connections(self) -> List[Dict]:
         """Get list of connections from Informatica Cloud"""
         url = f"{self.pod_url}/api/v2/connection"
-        response = requests.get(
-            url,
-            headers=self._get_auth_headers()
-        )
-        response.raise_for_status()
+        response = self._api_request('GET', url)
         return response.json()
 
     def create_connection(self, connection_data):
@@ -75,12 +66,7 @@ class InformaticaCloudAPI:
             dict: Created connection details
         """
         url = f"{self.pod_url}/api/v2/connection"
-        response = requests.post(
-            url,
-            headers=self._get_auth_headers(),
-            json=connection_data
-        )
-        response.raise_for_status()
+        response = self._api_request('POST', url, json=connection_data)
         return response.json()
 
 def get_informatica_api(credentials) -> Optional[InformaticaCloudAPI]:
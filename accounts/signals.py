@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token, invalidate_user_tokens
+from .models import CustomUser
+
+
+@receiver(post_delete, sender=Token)
+def discard_cached_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=CustomUser)
+def discard_cached_user(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_user_tokens(instance.pk)
@@ -97,6 +97,17 @@ DATABASES = {
 }
 
 
+# Cache
+# Informatica login sessions are shared through this cache. Use a backend
+# shared between processes (Redis, Memcached or the database) in production.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -148,7 +159,7 @@ AUTH_USER_MODEL = 'accounts.CustomUser'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -158,6 +169,9 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10,
 }
 
+# Seconds an authenticated token's user is served from the cache
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.getenv('AUTH_TOKEN_CACHE_TIMEOUT', 60))
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -221,6 +235,61 @@ ENCRYPTION_KEY = os.getenv('ENCRYPTION_KEY', 'your-encryption-key-here')  # Chan
 
 # Informatica API Settings
 INFORMATICA_BASE_URL = os.getenv('INFORMATICA_BASE_URL', 'https://dm-us.informaticacloud.com/ma/api/v2')
+INFORMATICA_USERNAME = os.getenv('INFORMATICA_USERNAME')
+INFORMATICA_PASSWORD = os.getenv('INFORMATICA_PASSWORD')
+INFORMATICA_HTTP_POOL_SIZE = int(os.getenv('INFORMATICA_HTTP_POOL_SIZE', 20))
+INFORMATICA_CONNECT_TIMEOUT = float(os.getenv('INFORMATICA_CONNECT_TIMEOUT', 5))
+INFORMATICA_READ_TIMEOUT = float(os.getenv('INFORMATICA_READ_TIMEOUT', 60))
+INFORMATICA_MAX_RETRIES = int(os.getenv('INFORMATICA_MAX_RETRIES', 3))
+INFORMATICA_RETRY_BACKOFF = float(os.getenv('INFORMATICA_RETRY_BACKOFF', 0.5))
+# Seconds to wait for a login already in progress in another thread or process
+INFORMATICA_LOGIN_WAIT = float(os.getenv('INFORMATICA_LOGIN_WAIT', 30))
+# Maximum number of items accepted by the bulk Informatica endpoints
+INFORMATICA_BULK_MAX_ITEMS = int(os.getenv('INFORMATICA_BULK_MAX_ITEMS', 1000))
+# Concurrent remote calls made by bulk connection provisioning
+INFORMATICA_BULK_CONCURRENCY = int(os.getenv('INFORMATICA_BULK_CONCURRENCY', 10))
+# Job status poller (poll_informatica_jobs); intervals are per job, in seconds
+INFORMATICA_POLL_BATCH_SIZE = int(os.getenv('INFORMATICA_POLL_BATCH_SIZE', 500))
+INFORMATICA_POLL_CONCURRENCY = int(os.getenv('INFORMATICA_POLL_CONCURRENCY', 8))
+INFORMATICA_POLL_MIN_INTERVAL = float(os.getenv('INFORMATICA_POLL_MIN_INTERVAL', 5))
+INFORMATICA_POLL_MAX_INTERVAL = float(os.getenv('INFORMATICA_POLL_MAX_INTERVAL', 300))
+# Job logs: seconds between remote refreshes of a running job's log, bytes per stored chunk
+INFORMATICA_LOG_REFRESH_INTERVAL = float(os.getenv('INFORMATICA_LOG_REFRESH_INTERVAL', 5))
+INFORMATICA_LOG_CHUNK_SIZE = int(os.getenv('INFORMATICA_LOG_CHUNK_SIZE', 1024 * 1024))
+
+# Connector catalog: server-side cache lifetime and browser max-age, in seconds
+CONNECTOR_CATALOG_CACHE_TIMEOUT = int(os.getenv('CONNECTOR_CATALOG_CACHE_TIMEOUT', 24 * 60 * 60))
+CONNECTOR_CATALOG_MAX_AGE = int(os.getenv('CONNECTOR_CATALOG_MAX_AGE', 0))
+
+# Workflow engine settings
+WORKFLOW_ENGINE_MAX_WORKERS = int(os.getenv('WORKFLOW_ENGINE_MAX_WORKERS', 8))
+WORKFLOW_PLAN_CACHE_SIZE = int(os.getenv('WORKFLOW_PLAN_CACHE_SIZE', 256))
+# Outputs of cacheable components kept per process, and for how many seconds
+WORKFLOW_RESULT_CACHE_SIZE = int(os.getenv('WORKFLOW_RESULT_CACHE_SIZE', 1024))
+WORKFLOW_RESULT_CACHE_TTL = int(os.getenv('WORKFLOW_RESULT_CACHE_TTL', 3600))
+# Component logs are written in bulk once this many are pending or the oldest is this many seconds old
+WORKFLOW_LOG_FLUSH_SIZE = int(os.getenv('WORKFLOW_LOG_FLUSH_SIZE', 500))
+WORKFLOW_LOG_FLUSH_INTERVAL = float(os.getenv('WORKFLOW_LOG_FLUSH_INTERVAL', 2))
+WORKFLOW_BATCH_MAX_INPUTS = int(os.getenv('WORKFLOW_BATCH_MAX_INPUTS', 100000))
+# Defaults for the timeout, max_retries and retry_backoff keys of a component configuration (0 disables the timeout)
+WORKFLOW_COMPONENT_TIMEOUT = float(os.getenv('WORKFLOW_COMPONENT_TIMEOUT', 300))
+WORKFLOW_COMPONENT_MAX_RETRIES = int(os.getenv('WORKFLOW_COMPONENT_MAX_RETRIES', 0))
+WORKFLOW_COMPONENT_RETRY_BACKOFF = float(os.getenv('WORKFLOW_COMPONENT_RETRY_BACKOFF', 1))
+WORKFLOW_COMPONENT_MAX_BACKOFF = float(os.getenv('WORKFLOW_COMPONENT_MAX_BACKOFF', 60))
+# Timed out handlers left running per process before components with a timeout stop being started
+WORKFLOW_MAX_ABANDONED_HANDLERS = int(os.getenv('WORKFLOW_MAX_ABANDONED_HANDLERS', 16))
+# An AI component is not invoked for this many seconds after this many consecutive failures (0 disables)
+WORKFLOW_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('WORKFLOW_CIRCUIT_FAILURE_THRESHOLD', 5))
+WORKFLOW_CIRCUIT_COOLDOWN = float(os.getenv('WORKFLOW_CIRCUIT_COOLDOWN', 60))
+# JSON payloads of at least this many bytes are stored once in the payload table and referenced
+PAYLOAD_INLINE_THRESHOLD = int(os.getenv('PAYLOAD_INLINE_THRESHOLD', 4096))
+WORKFLOW_WORKER_PROCESSES = int(os.getenv('WORKFLOW_WORKER_PROCESSES', 1))
+# Workers renew the lease of running executions this often; executions whose lease is older than the timeout are failed
+WORKFLOW_HEARTBEAT_INTERVAL = float(os.getenv('WORKFLOW_HEARTBEAT_INTERVAL', 30))
+WORKFLOW_LEASE_TIMEOUT = float(os.getenv('WORKFLOW_LEASE_TIMEOUT', 300))
+
+# Rows fetched per database round-trip by the NDJSON export endpoints
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
 
 # AWS Settings
 AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID')
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class InformaticaServicesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'informatica_services'
+
+    def ready(self):
+        from . import signals  # noqa: F401
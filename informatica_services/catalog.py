@@ -0,0 +1,60 @@
+"""
+Pre-rendered connector catalog responses.
+
+Rendered JSON bodies are stored in Django's cache together with a content
+hash used as the ETag. All entries live under a catalog version token that
+signals.py resets whenever a connector type or field changes, so a change
+invalidates every cached page at once (across processes with a shared
+cache backend).
+"""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+
+VERSION_KEY = 'informatica:catalog:version'
+
+
+def _catalog_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate_catalog():
+    """Discard every cached catalog response"""
+    cache.delete(VERSION_KEY)
+
+
+def _finalize(response, etag):
+    response['ETag'] = etag
+    patch_cache_control(
+        response, private=True, must_revalidate=True,
+        max_age=settings.CONNECTOR_CATALOG_MAX_AGE
+    )
+    return response
+
+
+def cached_catalog_response(request, key, render):
+    """
+    Serve the body cached under ``key``, calling ``render`` to produce the
+    JSON bytes on a miss. Answers 304 when the client already has the body.
+    """
+    cache_key = f'informatica:catalog:{_catalog_version()}:{hashlib.sha256(key.encode()).hexdigest()}'
+    entry = cache.get(cache_key)
+    if entry is None:
+        body = render()
+        entry = {'etag': f'"{hashlib.sha256(body).hexdigest()}"', 'body': body}
+        cache.set(cache_key, entry, settings.CONNECTOR_CATALOG_CACHE_TIMEOUT)
+
+    # If-None-Match uses the weak comparison
+    client_etags = {tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))}
+    if entry['etag'] in client_etags or '*' in client_etags:
+        return _finalize(HttpResponseNotModified(), entry['etag'])
+    return _finalize(HttpResponse(entry['body'], content_type='application/json'), entry['etag'])
@@ -0,0 +1,88 @@
+"""
+Local, compressed copies of Informatica job logs.
+
+Logs are stored as zlib-compressed chunks keyed by their byte offset. A log
+is refreshed from Informatica at most every INFORMATICA_LOG_REFRESH_INTERVAL
+seconds, asking only for the bytes after what is already stored. Once the
+execution has finished, the log is marked complete and is never fetched again.
+"""
+import logging
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import JobLog, JobLogChunk
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ('COMPLETED', 'FAILED')
+
+
+def _store(log, offset, data):
+    """Append ``data`` at ``offset`` unless another request already stored it"""
+    chunk_size = settings.INFORMATICA_LOG_CHUNK_SIZE
+    with transaction.atomic():
+        updated = JobLog.objects.filter(pk=log.pk, size=offset).update(size=offset + len(data))
+        if not updated:
+            return False
+        JobLogChunk.objects.bulk_create([
+            JobLogChunk(
+                log=log,
+                offset=offset + start,
+                size=len(data[start:start + chunk_size]),
+                data=zlib.compress(data[start:start + chunk_size])
+            )
+            for start in range(0, len(data), chunk_size)
+        ])
+    return True
+
+
+def sync_job_log(execution, client):
+    """
+    Bring the stored log of ``execution`` up to date and return it. Remote
+    errors are raised only when nothing has been stored yet.
+    """
+    log, _ = JobLog.objects.get_or_create(execution=execution)
+    now = timezone.now()
+    refresh_interval = timedelta(seconds=settings.INFORMATICA_LOG_REFRESH_INTERVAL)
+    if log.is_complete or (log.fetched_at and now - log.fetched_at < refresh_interval):
+        return log
+
+    # A job that had finished before the fetch started has a final log
+    finished = execution.status in FINISHED_STATUSES
+    offset = log.size
+    try:
+        data = client.get_job_log_content(execution.informatica_job_id, offset)
+    except Exception as e:
+        if not log.size:
+            raise
+        logger.warning("Failed to refresh log of execution %s: %s", execution.id, e)
+        return log
+
+    if data:
+        _store(log, offset, data)
+    JobLog.objects.filter(pk=log.pk).update(fetched_at=now, is_complete=finished)
+    log.refresh_from_db()
+    return log
+
+
+def read_job_log(log, start=0, end=None):
+    """Yield the stored bytes of ``log`` in the range [start, end)"""
+    end = log.size if end is None else min(end, log.size)
+    if start >= end:
+        return
+    chunks = (
+        JobLogChunk.objects
+        .filter(log=log, offset__lt=end)
+        .alias(chunk_end=F('offset') + F('size'))
+        .filter(chunk_end__gt=start)
+        .order_by('offset')
+        .values_list('offset', 'data')
+    )
+    for offset, data in chunks.iterator():
+        content = zlib.decompress(data)
+        yield content[max(start - offset, 0):end - offset]
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from informatica_services.reconciler import JobStatusReconciler
+
+
+class Command(BaseCommand):
+    help = 'Polls Informatica for running task executions and records their outcome'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Maximum number of jobs polled per cycle')
+        parser.add_argument('--concurrency', type=int, help='Number of concurrent status requests')
+        parser.add_argument('--sleep', type=float, default=1.0, help='Seconds between cycles')
+        parser.add_argument('--once', action='store_true', help='Run a single polling cycle')
+
+    def handle(self, *args, **options):
+        reconciler = JobStatusReconciler(
+            batch_size=options['batch_size'],
+            concurrency=options['concurrency']
+        )
+        self.stdout.write(self.style.SUCCESS('Informatica job poller started'))
+        try:
+            while True:
+                close_old_connections()
+                finished = reconciler.poll()
+                if finished:
+                    self.stdout.write(f'Recorded {finished} finished execution(s)')
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS('Informatica job poller stopped'))
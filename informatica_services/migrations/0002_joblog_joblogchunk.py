@@ -0,0 +1,38 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('informatica_services', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('size', models.PositiveBigIntegerField(default=0, help_text='Uncompressed size of the log in bytes')),
+                ('is_complete', models.BooleanField(default=False, help_text='Whether the job finished and the log is final')),
+                ('fetched_at', models.DateTimeField(blank=True, null=True)),
+                ('execution', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='job_log', to='informatica_services.taskexecution')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobLogChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('offset', models.PositiveBigIntegerField()),
+                ('size', models.PositiveIntegerField(help_text='Uncompressed size of the chunk in bytes')),
+                ('data', models.BinaryField()),
+                ('log', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='informatica_services.joblog')),
+            ],
+            options={
+                'ordering': ['offset'],
+                'unique_together': {('log', 'offset')},
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('informatica_services', '0002_joblog_joblogchunk'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='taskexecution',
+            index=models.Index(fields=['task', 'started_at'], name='task_execution_task_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskexecution',
+            index=models.Index(fields=['status', 'started_at'], name='task_execution_status_idx'),
+        ),
+    ]
@@ -131,10 +131,35 @@ class TaskExecution(models.Model):
     
     class Meta:
         ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['task', 'started_at'], name='task_execution_task_idx'),
+            models.Index(fields=['status', 'started_at'], name='task_execution_status_idx'),
+        ]
 
     def __str__(self):
         return f"Execution {self.id} of {self.task.name}"
 
+class JobLog(models.Model):
+    """Local copy of the Informatica log of a task execution, stored in compressed chunks"""
+    execution = models.OneToOneField(TaskExecution, on_delete=models.CASCADE, related_name='job_log')
+    size = models.PositiveBigIntegerField(default=0, help_text="Uncompressed size of the log in bytes")
+    is_complete = models.BooleanField(default=False, help_text="Whether the job finished and the log is final")
+    fetched_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Log of execution {self.execution_id}"
+
+class JobLogChunk(models.Model):
+    """A zlib-compressed byte range of a job log"""
+    log = models.ForeignKey(JobLog, on_delete=models.CASCADE, related_name='chunks')
+    offset = models.PositiveBigIntegerField()
+    size = models.PositiveIntegerField(help_text="Uncompressed size of the chunk in bytes")
+    data = models.BinaryField()
+
+    class Meta:
+        unique_together = ['log', 'offset']
+        ordering = ['offset']
+
 class InformaticaCredentials(models.Model):
     user = models.OneToOneField('accounts.CustomUser', on_delete=models.CASCADE)
     username = models.CharField(max_length=255)
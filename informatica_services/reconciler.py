@@ -0,0 +1,120 @@
+"""
+Reconciles RUNNING TaskExecution rows with the job status in Informatica.
+
+Each poll loads the in-flight executions in one query, asks Informatica
+about the jobs that are due on a bounded thread pool and writes every
+finished execution back with a single bulk_update. Jobs that are still
+running are polled again with a per-job exponential backoff, so thousands of
+long jobs cost far fewer than one request per job per second.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.utils import timezone
+
+from workflow_engine.payloads import offload_many
+
+from .models import TaskExecution
+from .services import InformaticaAPIClient
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATES = {
+    'SUCCESS': 'COMPLETED',
+    'COMPLETED': 'COMPLETED',
+    'WARNING': 'COMPLETED',
+    'FAILED': 'FAILED',
+    'ERROR': 'FAILED',
+    'STOPPED': 'FAILED',
+    'ABORTED': 'FAILED',
+    'CANCELLED': 'FAILED',
+}
+
+# Numeric activity log states: 1 success, 2 warning, 3 failed
+FINISHED_STATE_CODES = {1: 'COMPLETED', 2: 'COMPLETED', 3: 'FAILED'}
+
+
+def map_job_status(job):
+    """Return COMPLETED or FAILED for a finished job, or None while it is still running"""
+    state = job.get('executionState') or job.get('status') or job.get('state')
+    if isinstance(state, int):
+        return FINISHED_STATE_CODES.get(state)
+    return FINISHED_STATES.get(str(state).upper()) if state else None
+
+
+class JobStatusReconciler:
+    def __init__(self, client=None, batch_size=None, concurrency=None,
+                 min_interval=None, max_interval=None):
+        self.client = client or InformaticaAPIClient(
+            settings.INFORMATICA_BASE_URL,
+            settings.INFORMATICA_USERNAME,
+            settings.INFORMATICA_PASSWORD
+        )
+        self.batch_size = batch_size or settings.INFORMATICA_POLL_BATCH_SIZE
+        self.concurrency = concurrency or settings.INFORMATICA_POLL_CONCURRENCY
+        self.min_interval = min_interval or settings.INFORMATICA_POLL_MIN_INTERVAL
+        self.max_interval = max_interval or settings.INFORMATICA_POLL_MAX_INTERVAL
+        # execution id -> (monotonic time of the next poll, current interval)
+        self._schedule = {}
+
+    def _fetch(self, job_id):
+        try:
+            return self.client.get_job_status(job_id)
+        except Exception as e:
+            logger.warning("Failed to fetch status of Informatica job %s: %s", job_id, e)
+            return None
+
+    def _backoff(self, execution_id, now):
+        _, interval = self._schedule.get(execution_id, (now, self.min_interval / 2))
+        interval = min(interval * 2, self.max_interval)
+        self._schedule[execution_id] = (now + interval, interval)
+
+    def poll(self):
+        """Poll every due job once and return the number of executions that finished"""
+        now = time.monotonic()
+        in_flight = dict(
+            TaskExecution.objects
+            .filter(status='RUNNING', informatica_job_id__isnull=False)
+            .values_list('id', 'informatica_job_id')
+        )
+        # Forget executions that finished or were updated elsewhere
+        for execution_id in set(self._schedule) - set(in_flight):
+            del self._schedule[execution_id]
+
+        due = [
+            execution_id for execution_id in in_flight
+            if self._schedule.get(execution_id, (now,))[0] <= now
+        ]
+        due.sort(key=lambda execution_id: self._schedule.get(execution_id, (0,))[0])
+        due = due[:self.batch_size]
+        if not due:
+            return 0
+
+        with ThreadPoolExecutor(max_workers=self.concurrency,
+                                thread_name_prefix='informatica-poll') as pool:
+            jobs = list(pool.map(self._fetch, [in_flight[execution_id] for execution_id in due]))
+
+        finished = []
+        completed_at = timezone.now()
+        for execution_id, job in zip(due, jobs):
+            status = map_job_status(job) if isinstance(job, dict) else None
+            if status is None:
+                self._backoff(execution_id, now)
+                continue
+            finished.append(TaskExecution(
+                id=execution_id,
+                status=status,
+                completed_at=completed_at,
+                output_data=job,
+                error_message=(job.get('errorMsg') or job.get('errorMessage')) if status == 'FAILED' else None
+            ))
+            self._schedule.pop(execution_id, None)
+
+        for execution, output_data in zip(finished, offload_many([e.output_data for e in finished])):
+            execution.output_data = output_data
+        TaskExecution.objects.bulk_update(
+            finished, ['status', 'completed_at', 'output_data', 'error_message'], batch_size=500
+        )
+        return len(finished)
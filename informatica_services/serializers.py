@@ -1,8 +1,11 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import (
     ConnectorType, ConnectorField, InformaticaConnection,
     DataTask, TaskExecution, InformaticaCredentials
 )
+from .validators import get_connector_validator
+from workflow_engine.serializers import PayloadField, PayloadListSerializer
 
 class ConnectorFieldSerializer(serializers.ModelSerializer):
     class Meta:
@@ -34,40 +37,10 @@ class InformaticaConnectionSerializer(serializers.ModelSerializer):
         }
 
     def validate(self, data):
-        connector_type = data['connector_type']
-        config = data.get('connection_config', {})
-        credentials = data.get('credentials', {})
-
-        # Validate required fields
-        required_fields = connector_type.fields.filter(is_required=True)
-        for field in required_fields:
-            if field.is_credential:
-                if field.field_key not in credentials:
-                    raise serializers.ValidationError(
-                        f"Required credential field '{field.name}' is missing"
-                    )
-            else:
-                if field.field_key not in config:
-                    raise serializers.ValidationError(
-                        f"Required field '{field.name}' is missing"
-                    )
-
-        # Validate field types
-        for field in connector_type.fields.all():
-            value = credentials.get(field.field_key) if field.is_credential else config.get(field.field_key)
-            if value is not None:
-                if field.field_type == 'NUMBER' and not isinstance(value, (int, float)):
-                    raise serializers.ValidationError(
-                        f"Field '{field.name}' must be a number"
-                    )
-                elif field.field_type == 'BOOLEAN' and not isinstance(value, bool):
-                    raise serializers.ValidationError(
-                        f"Field '{field.name}' must be a boolean"
-                    )
-                elif field.field_type == 'SELECT' and field.options and value not in field.options:
-                    raise serializers.ValidationError(
-                        f"Field '{field.name}' must be one of: {', '.join(field.options)}"
-                    )
+        validator = get_connector_validator(data['connector_type'])
+        errors = validator.validate(data.get('connection_config'), data.get('credentials'))
+        if errors:
+            raise serializers.ValidationError(errors)
 
         return data
 
@@ -113,9 +86,11 @@ class DataTaskSerializer(serializers.ModelSerializer):
 
 class TaskExecutionSerializer(serializers.ModelSerializer):
     task_details = DataTaskSerializer(source='task', read_only=True)
+    output_data = PayloadField(read_only=True)
 
     class Meta:
         model = TaskExecution
+        list_serializer_class = PayloadListSerializer
         fields = ['id', 'task', 'task_details', 'started_at', 'completed_at',
                  'status', 'executed_by', 'input_params', 'output_data',
                  'error_message', 'informatica_job_id']
@@ -126,12 +101,25 @@ class TaskExecutionSerializer(serializers.ModelSerializer):
         validated_data['executed_by'] = self.context['request'].user
         return super().create(validated_data)
 
+class TaskExecutionExportSerializer(TaskExecutionSerializer):
+    class Meta(TaskExecutionSerializer.Meta):
+        fields = ['id', 'task', 'started_at', 'completed_at', 'status',
+                 'executed_by', 'input_params', 'output_data',
+                 'error_message', 'informatica_job_id']
+
 class ConnectionTestSerializer(serializers.Serializer):
     connection_id = serializers.IntegerField()
 
 class MappingExecuteSerializer(serializers.Serializer):
     runtime_params = serializers.JSONField(required=False)
 
+class BulkJobStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=settings.INFORMATICA_BULK_MAX_ITEMS
+    )
+
 class InformaticaCredentialsSerializer(serializers.ModelSerializer):
     class Meta:
         model = InformaticaCredentials
@@ -1,145 +1,189 @@
+import asyncio
 import requests
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from asgiref.sync import async_to_sync
 from django.conf import settings
-from datetime import datetime, timedelta
-
-class InformaticaAPIClient:
-    def __init__(self, base_url, username, password):
-        self.base_url = base_url
-        self.username = username
-        self.password = password
-        self.session_id = None
-        self.session_expiry = None
-
-    def _get_auth_headers(self):
-        """Get authentication headers with session ID if available"""
-        if not self.session_id or datetime.now() >= self.session_expiry:
-            self._login()
-        
-        return {
-            'Content-Type': 'application/json',
-            'INFA-SESSION-ID': self.session_id
-        }
+from datetime import timedelta
+from .transport import SessionClient
 
+class InformaticaAPIClient(SessionClient):
     def _login(self):
-        """Login to Informatica API and get session ID"""
+        """Login to Informatica API and return the new session"""
         login_url = f"{self.base_url}/api/v2/user/login"
-        response = requests.post(
-            login_url,
-            json={
-                "username": self.username,
-                "password": self.password
-            }
-        )
-        response.raise_for_status()
+        credentials = {
+            "username": self.username,
+            "password": self.password
+        }
+        if self.security_domain:
+            credentials["securityDomain"] = self.security_domain
+        response = self._request('POST', login_url, json=credentials)
         data = response.json()
-        self.session_id = data['sessionId']
-        # Set session expiry to 23 hours from now (sessions typically last 24 hours)
-        self.session_expiry = datetime.now() + timedelta(hours=23)
+        # Sessions typically last 24 hours; treat them as valid for 23
+        return {
+            'session_id': data['sessionId'],
+            'expires_at': time.time() + timedelta(hours=23).total_seconds()
+        }
 
     def create_connection(self, connection_data):
         """Create a new connection in Informatica"""
         url = f"{self.base_url}/api/v2/connection"
-        response = requests.post(
-            url,
-            headers=self._get_auth_headers(),
-            json=connection_data
-        )
-        response.raise_for_status()
+        response = self._api_request('POST', url, json=connection_data)
         return response.json()
 
     def test_connection(self, connection_id):
         """Test an existing connection"""
         url = f"{self.base_url}/api/v2/connection/{connection_id}/test"
-        response = requests.post(
-            url,
-            headers=self._get_auth_headers()
-        )
-        response.raise_for_status()
+        response = self._api_request('POST', url)
         return response.json()
 
     def create_mapping(self, mapping_data):
         """Create a new mapping task"""
         url = f"{self.base_url}/api/v2/mapping"
-        response = requests.post(
-            url,
-            headers=self._get_auth_headers(),
-            json=mapping_data
-        )
-        response.raise_for_status()
+        response = self._api_request('POST', url, json=mapping_data)
         return response.json()
 
     def execute_mapping(self, mapping_id, runtime_params=None):
         """Execute a mapping task"""
         url = f"{self.base_url}/api/v2/mapping/{mapping_id}/execute"
         data = {"runtimeParameters": runtime_params} if runtime_params else {}
-        response = requests.post(
-            url,
-            headers=self._get_auth_headers(),
-            json=data
-        )
-        response.raise_for_status()
+        response = self._api_request('POST', url, json=data)
         return response.json()
 
     def get_job_status(self, job_id):
         """Get the status of a job"""
         url = f"{self.base_url}/api/v2/activity/job/{job_id}"
-        response = requests.get(
-            url,
-            headers=self._get_auth_headers()
-        )
-        response.raise_for_status()
+        response = self._api_request('GET', url)
         return response.json()
 
     def get_job_logs(self, job_id):
         """Get logs for a specific job"""
         url = f"{self.base_url}/api/v2/activity/job/{job_id}/log"
-        response = requests.get(
-            url,
-            headers=self._get_auth_headers()
-        )
-        response.raise_for_status()
+        response = self._api_request('GET', url)
         return response.json()
 
+    def get_job_log_content(self, job_id, offset=0):
+        """Get the raw log of a job from byte ``offset`` onwards"""
+        url = f"{self.base_url}/api/v2/activity/job/{job_id}/log"
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+        try:
+            response = self._api_request('GET', url, headers=headers)
+        except requests.HTTPError as e:
+            # Nothing was appended since the last fetch
+            if e.response is not None and e.response.status_code == 416:
+                return b''
+            raise
+        if response.status_code == 206:
+            return response.content
+        # The server ignored the range and sent the whole log
+        return response.content[offset:]
+
     def list_connections(self, connection_type=None):
         """List all connections or filter by type"""
         url = f"{self.base_url}/api/v2/connection"
         params = {"type": connection_type} if connection_type else {}
-        response = requests.get(
-            url,
-            headers=self._get_auth_headers(),
-            params=params
-        )
-        response.raise_for_status()
+        response = self._api_request('GET', url, params=params)
         return response.json()
 
     def get_connection_details(self, connection_id):
         """Get details of a specific connection"""
         url = f"{self.base_url}/api/v2/connection/{connection_id}"
-        response = requests.get(
-            url,
-            headers=self._get_auth_headers()
-        )
-        response.raise_for_status()
+        response = self._api_request('GET', url)
         return response.json()
 
     def update_connection(self, connection_id, connection_data):
         """Update an existing connection"""
         url = f"{self.base_url}/api/v2/connection/{connection_id}"
-        response = requests.put(
-            url,
-            headers=self._get_auth_headers(),
-            json=connection_data
-        )
-        response.raise_for_status()
+        response = self._api_request('PUT', url, json=connection_data)
         return response.json()
 
     def delete_connection(self, connection_id):
         """Delete a connection"""
         url = f"{self.base_url}/api/v2/connection/{connection_id}"
-        response = requests.delete(
-            url,
-            headers=self._get_auth_headers()
-        )
-        response.raise_for_status()
-        return response.status_code == 204 
\ No newline at end of file
+        response = self._api_request('DELETE', url)
+        return response.status_code == 204
+
+
+def _async_method(name):
+    async def method(self, *args, **kwargs):
+        return await self._call(getattr(self._client, name), *args, **kwargs)
+    method.__name__ = name
+    method.__doc__ = getattr(InformaticaAPIClient, name).__doc__
+    return method
+
+
+class AsyncInformaticaAPIClient:
+    """
+    Asyncio counterpart of InformaticaAPIClient with the same methods.
+
+    Calls run on the client's own pool of ``max_concurrency`` threads over
+    the shared pooled HTTP session and the shared login session, so
+    gathering hundreds of calls costs roughly ``calls / max_concurrency``
+    round trips instead of one per call. Connections beyond
+    INFORMATICA_HTTP_POOL_SIZE per host are not kept alive, so keep
+    ``max_concurrency`` within it. Call ``close`` to release the threads.
+    """
+
+    def __init__(self, base_url, username, password, security_domain=None, max_concurrency=None):
+        self._client = InformaticaAPIClient(base_url, username, password, security_domain)
+        self.max_concurrency = max_concurrency or settings.INFORMATICA_HTTP_POOL_SIZE
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix='informatica-async'
+                )
+            return self._executor
+
+    def close(self):
+        """Release the client's threads once pending calls are done"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    async def _call(self, func, *args, **kwargs):
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), partial(func, *args, **kwargs))
+
+    async def gather(self, method, arguments):
+        """
+        Call ``method`` once per item of ``arguments`` concurrently. Results
+        come back in order; failed calls are returned as their exception.
+        """
+        call = getattr(self, method)
+        return await asyncio.gather(*(call(*args) for args in arguments), return_exceptions=True)
+
+    create_connection = _async_method('create_connection')
+    test_connection = _async_method('test_connection')
+    create_mapping = _async_method('create_mapping')
+    execute_mapping = _async_method('execute_mapping')
+    get_job_status = _async_method('get_job_status')
+    get_job_logs = _async_method('get_job_logs')
+    get_job_log_content = _async_method('get_job_log_content')
+    list_connections = _async_method('list_connections')
+    get_connection_details = _async_method('get_connection_details')
+    update_connection = _async_method('update_connection')
+    delete_connection = _async_method('delete_connection')
+
+
+def call_many(client, method, arguments):
+    """
+    Synchronous wrapper around ``AsyncInformaticaAPIClient.gather`` for
+    views and management commands. The client is closed afterwards.
+    """
+    try:
+        return async_to_sync(client.gather)(method, [
+            args if isinstance(args, tuple) else (args,) for args in arguments
+        ])
+    finally:
+        client.close()
@@ -0,0 +1,84 @@
+"""
+Process-wide cache of Informatica login sessions.
+
+Sessions are stored in Django's cache backend, keyed by a digest of the pod URL,
+username, password and security domain, so every thread and (with a shared cache
+backend) every worker process reuses one login. Refreshes are
+single-flighted: one caller logs in while the others wait for its result.
+"""
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Cached sessions are dropped this many seconds before they actually expire
+EXPIRY_MARGIN = 60
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _cache_key(base_url, username, password, security_domain):
+    digest = hashlib.sha256(
+        f'{base_url}\0{username}\0{password}\0{security_domain or ""}'.encode()
+    ).hexdigest()
+    return f'informatica:session:{digest}'
+
+
+def _local_lock(key):
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def get_session_token(base_url, username, password, login, security_domain=None):
+    """
+    Return the cached session for these credentials, calling ``login`` to
+    create one if needed. ``login`` must return a dict with at least
+    ``session_id`` and ``expires_at`` (a Unix timestamp).
+    """
+    key = _cache_key(base_url, username, password, security_domain)
+    session = cache.get(key)
+    if session:
+        return session
+
+    # Threads of this process queue up here; other processes on the cache lock
+    with _local_lock(key):
+        session = cache.get(key)
+        if session:
+            return session
+
+        lock_key = f'{key}:lock'
+        deadline = time.monotonic() + settings.INFORMATICA_LOGIN_WAIT
+        while not cache.add(lock_key, True, timeout=settings.INFORMATICA_LOGIN_WAIT):
+            time.sleep(0.1)
+            session = cache.get(key)
+            if session:
+                return session
+            if time.monotonic() >= deadline:
+                # The other login is taking too long; do our own
+                break
+
+        try:
+            session = login()
+            timeout = session['expires_at'] - time.time() - EXPIRY_MARGIN
+            if timeout > 0:
+                cache.set(key, session, timeout=timeout)
+            return session
+        finally:
+            cache.delete(lock_key)
+
+
+def invalidate_session_token(base_url, username, password, session_id=None, security_domain=None):
+    """
+    Forget the cached session, e.g. after a 401. With ``session_id`` the
+    entry is only removed if it still holds that session, so a session
+    refreshed by another worker in the meantime is kept.
+    """
+    key = _cache_key(base_url, username, password, security_domain)
+    if session_id is not None:
+        session = cache.get(key)
+        if not session or session['session_id'] != session_id:
+            return
+    cache.delete(key)
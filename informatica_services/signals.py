@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .catalog import invalidate_catalog
+from .models import ConnectorField, ConnectorType
+from .validators import invalidate_connector_validators
+
+
+@receiver(post_save, sender=ConnectorField)
+@receiver(post_delete, sender=ConnectorField)
+def invalidate_connector_fields(sender, instance, **kwargs):
+    # Validators cached by other processes are stamped with the connector type's
+    # updated_at; bumping it makes them rebuild with the changed fields
+    ConnectorType.objects.filter(pk=instance.connector_type_id).update(updated_at=timezone.now())
+    invalidate_connector_validators(instance.connector_type_id)
+    invalidate_catalog()
+
+
+@receiver(post_save, sender=ConnectorType)
+@receiver(post_delete, sender=ConnectorType)
+def invalidate_connector_type(sender, instance, **kwargs):
+    invalidate_connector_validators(instance.pk)
+    invalidate_catalog()
@@ -0,0 +1,126 @@
+"""
+Shared HTTP transport for the Informatica API clients.
+
+Clients are created per request, so each process keeps one pooled,
+keep-alive ``requests.Session`` per Informatica host instead. Idempotent
+calls are retried with exponential backoff on 429 and 5xx responses;
+non-idempotent calls are only retried on 429, which the server rejected
+before doing any work. ``SessionClient`` is the base of both API clients.
+"""
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .session_tokens import get_session_token, invalidate_session_token
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+class InformaticaRetry(Retry):
+    """Retry policy that also retries rate-limited non-idempotent requests"""
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if status_code == 429:
+            return bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def _build_session():
+    retry = InformaticaRetry(
+        total=settings.INFORMATICA_MAX_RETRIES,
+        backoff_factor=settings.INFORMATICA_RETRY_BACKOFF,
+        status_forcelist=(500, 502, 503, 504),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=settings.INFORMATICA_HTTP_POOL_SIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # The session is shared by every user's client; never carry cookies across them
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session(base_url):
+    """Return the process-wide session for the host of ``base_url``"""
+    parts = urlsplit(base_url)
+    key = (parts.scheme, parts.netloc)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = _build_session()
+    return session
+
+
+def get_timeout():
+    """(connect, read) timeout applied to every Informatica request"""
+    return (settings.INFORMATICA_CONNECT_TIMEOUT, settings.INFORMATICA_READ_TIMEOUT)
+
+
+class SessionClient:
+    """
+    Base for clients that authenticate with a cached Informatica login
+    session. Subclasses implement ``_login`` and may extend
+    ``_get_auth_headers``.
+    """
+
+    def __init__(self, base_url, username, password, security_domain=None):
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.security_domain = security_domain
+        self.session = get_session(base_url)
+        self.timeout = get_timeout()
+
+    def _request(self, method, url, **kwargs):
+        """Send a request over the pooled session and raise on HTTP errors"""
+        response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def _api_request(self, method, url, **kwargs):
+        """Send an authenticated request, logging in again once if the session was rejected"""
+        extra_headers = kwargs.pop('headers', None) or {}
+        # Clients are shared between threads, so each call keeps track of its own session
+        token = self._get_session_token()
+        try:
+            return self._request(method, url, headers={**self._get_auth_headers(token), **extra_headers}, **kwargs)
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 401:
+                raise
+            invalidate_session_token(
+                self.base_url, self.username, self.password,
+                session_id=token['session_id'], security_domain=self.security_domain
+            )
+            token = self._get_session_token()
+            return self._request(method, url, headers={**self._get_auth_headers(token), **extra_headers}, **kwargs)
+
+    def _get_session_token(self):
+        """Return the shared login session, logging in when none is cached"""
+        return get_session_token(
+            self.base_url, self.username, self.password, self._login,
+            security_domain=self.security_domain
+        )
+
+    def _get_auth_headers(self, token=None):
+        """Get authentication headers for ``token``, or for the shared session"""
+        token = token or self._get_session_token()
+        return {
+            'Content-Type': 'application/json',
+            'INFA-SESSION-ID': token['session_id']
+        }
+
+    def _login(self):
+        """Log in and return a dict with ``session_id`` and ``expires_at``"""
+        raise NotImplementedError
@@ -0,0 +1,119 @@
+"""
+Compiled validators for connection payloads.
+
+The fields of a connector type are turned into a ConnectorValidator once, with
+regexes compiled and option lists frozen, and cached per process. Cache entries
+are keyed by ``ConnectorType.updated_at``, which signals.py bumps whenever a
+field changes, so an edit in any process invalidates every other process too.
+"""
+import logging
+import re
+from dataclasses import dataclass
+
+from workflow_engine.cache import LRUCache
+
+from .models import ConnectorField
+
+logger = logging.getLogger(__name__)
+
+_validators = LRUCache(maxsize=256)
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    key: str
+    name: str
+    field_type: str
+    is_required: bool
+    is_credential: bool
+    pattern: re.Pattern = None
+    options: frozenset = None
+    option_list: tuple = ()
+
+
+def _compile_rule(field):
+    pattern = None
+    if field.validation_regex:
+        try:
+            pattern = re.compile(field.validation_regex)
+        except re.error as e:
+            logger.warning("Ignoring invalid validation regex of field %s: %s", field.pk, e)
+    options = None
+    if field.options and field.field_type in ('SELECT', 'MULTISELECT'):
+        try:
+            options = frozenset(field.options)
+        except TypeError:
+            options = tuple(field.options)
+    return FieldRule(
+        key=field.field_key,
+        name=field.name,
+        field_type=field.field_type,
+        is_required=field.is_required,
+        is_credential=field.is_credential,
+        pattern=pattern,
+        options=options,
+        option_list=tuple(str(option) for option in field.options or ()),
+    )
+
+
+class ConnectorValidator:
+    """Checks connection configuration and credentials against the fields of a connector type"""
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+
+    def _check(self, rule, value):
+        # bool is a subclass of int, but True is not a number here
+        if rule.field_type == 'NUMBER' and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            return f"Field '{rule.name}' must be a number"
+        if rule.field_type == 'BOOLEAN' and not isinstance(value, bool):
+            return f"Field '{rule.name}' must be a boolean"
+        if rule.options is not None:
+            values = value if rule.field_type == 'MULTISELECT' and isinstance(value, list) else [value]
+            try:
+                invalid = any(item not in rule.options for item in values)
+            except TypeError:
+                invalid = True
+            if invalid:
+                return f"Field '{rule.name}' must be one of: {', '.join(rule.option_list)}"
+        if rule.pattern is not None and isinstance(value, str) and not rule.pattern.fullmatch(value):
+            return f"Field '{rule.name}' has an invalid format"
+        return None
+
+    def validate(self, config, credentials):
+        """Return the list of error messages for a payload, empty when it is valid"""
+        config = config or {}
+        credentials = credentials or {}
+        errors = []
+        for rule in self.rules:
+            source = credentials if rule.is_credential else config
+            if rule.key not in source:
+                if rule.is_required:
+                    kind = 'credential field' if rule.is_credential else 'field'
+                    errors.append(f"Required {kind} '{rule.name}' is missing")
+                continue
+            value = source[rule.key]
+            if value is not None:
+                error = self._check(rule, value)
+                if error:
+                    errors.append(error)
+        return errors
+
+
+def get_connector_validator(connector_type):
+    """Return the compiled validator for ``connector_type``, building it on first use"""
+    cached = _validators.get(connector_type.pk)
+    if cached is not None and cached[0] == connector_type.updated_at:
+        return cached[1]
+    fields = ConnectorField.objects.filter(connector_type_id=connector_type.pk).order_by('order', 'id')
+    validator = ConnectorValidator(_compile_rule(field) for field in fields)
+    _validators.set(connector_type.pk, (connector_type.updated_at, validator))
+    return validator
+
+
+def invalidate_connector_validators(connector_type_id=None):
+    """Drop the cached validator of one connector type, or of all of them"""
+    if connector_type_id is None:
+        _validators.clear()
+    else:
+        _validators.discard(lambda key: key == connector_type_id)
@@ -2,7 +2,9 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
 from .models import (
     ConnectorType, ConnectorField, InformaticaConnection,
     DataTask, TaskExecution
@@ -11,21 +13,57 @@ from .serializers import (
     ConnectorTypeSerializer, ConnectorFieldSerializer,
     InformaticaConnectionSerializer, DataTaskSerializer,
     TaskExecutionSerializer, ConnectionTestSerializer,
-    MappingExecuteSerializer
+    MappingExecuteSerializer, TaskExecutionExportSerializer,
+    BulkJobStatusSerializer
 )
-from .services import InformaticaAPIClient
+from .services import InformaticaAPIClient, AsyncInformaticaAPIClient, call_many
+from .job_logs import read_job_log, sync_job_log
+from .catalog import cached_catalog_response
 from workflow_engine.permissions import IsOrganizationMember
+from workflow_engine.mixins import EagerLoadingMixin, SummaryListMixin
+from workflow_engine.pagination import ExecutionCursorPagination
+from workflow_engine.ndjson import chunks, streaming_response
 from rest_framework.exceptions import ValidationError
 from accounts.models import InformaticaCredentials
 
-class ConnectorTypeViewSet(viewsets.ReadOnlyModelViewSet):
+def _remote_connection_data(connection):
+    """Payload describing ``connection`` to the Informatica API"""
+    return {
+        'name': connection.name,
+        'type': connection.connector_type.informatica_type,
+        'properties': {
+            **connection.connection_config,
+            **(connection.credentials or {})
+        }
+    }
+
+class ConnectorTypeViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     """
     Read-only viewset for connector types. Connector types are managed through
     the management command and cannot be modified through the API.
     """
     serializer_class = ConnectorTypeSerializer
     permission_classes = [IsAuthenticated]
-    queryset = ConnectorType.objects.filter(is_active=True)
+    queryset = ConnectorType.objects.filter(is_active=True).order_by('name')
+
+    def _cached(self, request, render):
+        # Only JSON responses are cached; the browsable API renders as usual
+        if request.accepted_renderer.format != 'json':
+            return Response(render())
+        return cached_catalog_response(
+            request, request.build_absolute_uri(),
+            lambda: JSONRenderer().render(render())
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(request, lambda: super(ConnectorTypeViewSet, self).list(request, *args, **kwargs).data)
+
+    @action(detail=False)
+    def catalog(self, request):
+        """Every active connector type with its fields, unpaginated"""
+        return self._cached(
+            request, lambda: self.get_serializer(self.filter_queryset(self.get_queryset()), many=True).data
+        )
 
     @action(detail=True)
     def fields(self, request, pk=None):
@@ -35,32 +73,30 @@ class ConnectorTypeViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = ConnectorFieldSerializer(fields, many=True)
         return Response(serializer.data)
 
-class InformaticaConnectionViewSet(viewsets.ModelViewSet):
+class InformaticaConnectionViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     serializer_class = InformaticaConnectionSerializer
     permission_classes = [IsAuthenticated, IsOrganizationMember]
 
     def get_queryset(self):
         return InformaticaConnection.objects.filter(
-            organization=self.request.user.organization
+            organization_id=self.request.user.organization_id
         )
 
-    def get_informatica_client(self):
+    def get_informatica_credentials(self):
+        # Credentials are shared by the deployment; see accounts.views.InformaticaCredentialsViewSet
         try:
-            credentials = InformaticaCredentials.objects.get(user=self.request.user)
-            # Decrypt password
-            from django.conf import settings
-            from cryptography.fernet import Fernet
-            f = Fernet(settings.ENCRYPTION_KEY.encode())
-            decrypted_password = f.decrypt(credentials.password.encode()).decode()
-            
-            return InformaticaAPIClient(
-                settings.INFORMATICA_BASE_URL,
-                credentials.username,
-                decrypted_password,
-                credentials.security_domain
-            )
+            credentials = InformaticaCredentials.objects.latest('created_at')
         except InformaticaCredentials.DoesNotExist:
             raise ValidationError("Please configure your Informatica credentials first")
+        return (
+            credentials.pod_url.rstrip('/'),
+            credentials.username,
+            credentials.password,
+            credentials.security_domain
+        )
+
+    def get_informatica_client(self):
+        return InformaticaAPIClient(*self.get_informatica_credentials())
 
     def perform_create(self, serializer):
         connection = serializer.save()
@@ -68,22 +104,79 @@ class InformaticaConnectionViewSet(viewsets.ModelViewSet):
         
         try:
             # Create the connection in Informatica
-            connection_data = {
-                'name': connection.name,
-                'type': connection.connector_type.informatica_type,
-                'properties': {
-                    **connection.connection_config,
-                    **connection.credentials
-                }
-            }
-            
-            result = client.create_connection(connection_data)
+            result = client.create_connection(_remote_connection_data(connection))
             connection.informatica_connection_id = result['id']
             connection.save()
             
         except Exception as e:
             connection.delete()
-            raise serializer.ValidationError(str(e))
+            raise ValidationError(str(e))
+
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request):
+        """
+        Create many connections at once. All payloads are validated before
+        anything is written; connections are then inserted in one query and
+        provisioned in Informatica concurrently. Connections that fail to
+        provision are deleted again and reported per item.
+        """
+        items = request.data.get('connections') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({'connections': 'Expected a non-empty list of connections'})
+        if len(items) > settings.INFORMATICA_BULK_MAX_ITEMS:
+            raise ValidationError({
+                'connections': f'At most {settings.INFORMATICA_BULK_MAX_ITEMS} connections can be created at once'
+            })
+
+        serializer = self.get_serializer(data=items, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        seen, duplicates = set(), []
+        for index, data in enumerate(serializer.validated_data):
+            key = (data['name'], data['organization'].pk)
+            if key in seen:
+                duplicates.append(f"Duplicate connection name '{data['name']}' at index {index}")
+            seen.add(key)
+        if duplicates:
+            raise ValidationError({'connections': duplicates})
+
+        client = AsyncInformaticaAPIClient(
+            *self.get_informatica_credentials(),
+            max_concurrency=settings.INFORMATICA_BULK_CONCURRENCY
+        )
+        connections = InformaticaConnection.objects.bulk_create([
+            InformaticaConnection(created_by=request.user, **data)
+            for data in serializer.validated_data
+        ])
+        results = call_many(client, 'create_connection', [
+            _remote_connection_data(connection) for connection in connections
+        ])
+
+        report, provisioned, failed = [], [], []
+        for index, (connection, result) in enumerate(zip(connections, results)):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                connection.informatica_connection_id = result['id']
+            except Exception as e:
+                failed.append(connection.pk)
+                report.append({'index': index, 'name': connection.name, 'status': 'failed', 'error': str(e)})
+            else:
+                provisioned.append(connection)
+                report.append({
+                    'index': index, 'name': connection.name, 'status': 'created',
+                    'id': connection.pk,
+                    'informatica_connection_id': connection.informatica_connection_id
+                })
+
+        InformaticaConnection.objects.bulk_update(provisioned, ['informatica_connection_id'])
+        if failed:
+            InformaticaConnection.objects.filter(pk__in=failed).delete()
+
+        return Response(
+            {'created': len(provisioned), 'failed': len(failed), 'results': report},
+            status=status.HTTP_207_MULTI_STATUS if failed else status.HTTP_201_CREATED
+        )
 
     @action(detail=True, methods=['post'])
     def test_connection(self, request, pk=None):
@@ -99,13 +192,15 @@ class InformaticaConnectionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-class DataTaskViewSet(viewsets.ModelViewSet):
+class DataTaskViewSet(SummaryListMixin, EagerLoadingMixin, viewsets.ModelViewSet):
     serializer_class = DataTaskSerializer
     permission_classes = [IsAuthenticated, IsOrganizationMember]
+    summary_fields = ('id', 'name', 'description', 'task_type', 'organization', 'created_by',
+                      'created_at', 'updated_at', 'status', 'source_connection', 'target_connection')
 
     def get_queryset(self):
         return DataTask.objects.filter(
-            organization=self.request.user.organization
+            organization_id=self.request.user.organization_id
         )
 
     @action(detail=True, methods=['post'])
@@ -152,17 +247,67 @@ class DataTaskViewSet(viewsets.ModelViewSet):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class TaskExecutionViewSet(viewsets.ReadOnlyModelViewSet):
+class TaskExecutionViewSet(SummaryListMixin, EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = TaskExecutionSerializer
     permission_classes = [IsAuthenticated, IsOrganizationMember]
+    summary_fields = ('id', 'task', 'started_at', 'completed_at', 'status', 'executed_by',
+                      'error_message', 'informatica_job_id')
+    pagination_class = ExecutionCursorPagination
 
     def get_queryset(self):
         return TaskExecution.objects.filter(
-            task__organization=self.request.user.organization
+            task__organization_id=self.request.user.organization_id
+        )
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream every task execution as NDJSON"""
+        queryset = self.get_queryset().order_by('id')
+        chunk_size = settings.EXPORT_CHUNK_SIZE
+        # Serializing a chunk at once loads its payloads with one query
+        records = (
+            record
+            for chunk in chunks(queryset.iterator(chunk_size=chunk_size), chunk_size)
+            for record in TaskExecutionExportSerializer(chunk, many=True).data
         )
+        return streaming_response(records, 'task-executions.ndjson')
+
+    @action(detail=False, methods=['post'])
+    def bulk_status(self, request):
+        """Fetch the Informatica job status of many executions concurrently"""
+        serializer = BulkJobStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        executions = list(
+            self.get_queryset()
+            .filter(id__in=serializer.validated_data['ids'], informatica_job_id__isnull=False)
+            .order_by('id')
+            .values('id', 'status', 'informatica_job_id')
+        )
+        client = AsyncInformaticaAPIClient(
+            settings.INFORMATICA_BASE_URL,
+            settings.INFORMATICA_USERNAME,
+            settings.INFORMATICA_PASSWORD
+        )
+        jobs = call_many(client, 'get_job_status', [
+            execution['informatica_job_id'] for execution in executions
+        ])
+
+        results = []
+        for execution, job in zip(executions, jobs):
+            if isinstance(job, Exception):
+                results.append({**execution, 'job': None, 'error': str(job)})
+            else:
+                results.append({**execution, 'job': job, 'error': None})
+        return Response({'results': results})
 
     @action(detail=True, methods=['get'])
     def logs(self, request, pk=None):
+        """
+        Stream the job log as plain text from the local copy. Supports a
+        ``Range: bytes=...`` header and ``offset``/``length`` query params;
+        X-Log-Size gives the offset to resume from when tailing.
+        """
         execution = self.get_object()
         
         if not execution.informatica_job_id:
@@ -178,10 +323,57 @@ class TaskExecutionViewSet(viewsets.ReadOnlyModelViewSet):
         )
         
         try:
-            logs = client.get_job_logs(execution.informatica_job_id)
-            return Response(logs)
+            log = sync_job_log(execution, client)
         except Exception as e:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
-            ) 
\ No newline at end of file
+            )
+
+        range_header = request.headers.get('Range')
+        try:
+            if range_header:
+                start, end = _parse_byte_range(range_header, log.size)
+            else:
+                start = int(request.query_params.get('offset', 0))
+                length = request.query_params.get('length')
+                end = start + int(length) if length is not None else log.size
+                if start < 0 or end < start:
+                    raise ValueError
+        except ValueError:
+            if range_header:
+                response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+                response['Content-Range'] = f'bytes */{log.size}'
+                return response
+            raise ValidationError({'offset': 'offset and length must be non-negative integers'})
+        end = min(end, log.size)
+
+        response = StreamingHttpResponse(
+            read_job_log(log, start, end),
+            content_type='text/plain; charset=utf-8',
+            status=status.HTTP_206_PARTIAL_CONTENT if range_header else status.HTTP_200_OK
+        )
+        if range_header:
+            response['Content-Range'] = f'bytes {start}-{end - 1}/{log.size}'
+        response['Content-Length'] = str(max(end - start, 0))
+        response['Accept-Ranges'] = 'bytes'
+        response['X-Log-Size'] = str(log.size)
+        response['X-Log-Complete'] = 'true' if log.is_complete else 'false'
+        return response
+
+
+def _parse_byte_range(header, size):
+    """Return the [start, end) range of a single-range ``bytes=`` header"""
+    unit, _, spec = header.partition('=')
+    if unit.strip() != 'bytes' or ',' in spec:
+        raise ValueError(header)
+    first, _, last = spec.strip().partition('-')
+    if not first:
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size
+    else:
+        start = int(first)
+        end = int(last) + 1 if last else size
+    if start < 0 or start >= size or end <= start:
+        raise ValueError(header)
+    return start, min(end, size)
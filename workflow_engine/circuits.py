@@ -0,0 +1,79 @@
+"""
+Per-AI-component circuit breakers.
+
+After WORKFLOW_CIRCUIT_FAILURE_THRESHOLD consecutive failures of an AI
+component, the engine stops invoking it for WORKFLOW_CIRCUIT_COOLDOWN seconds
+and fails its nodes straight away. Once the cool-down has passed a single call
+is let through; success closes the circuit, another failure opens it again.
+State is kept per process, along with the version of the AI component it was
+recorded for: once the component is updated, its earlier failures no longer
+count in any process.
+"""
+import threading
+import time
+
+from django.conf import settings
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of invoking a component whose circuit is open"""
+
+
+class CircuitBreaker:
+    """Thread-safe failure counters keyed by AI component id"""
+
+    def __init__(self, failure_threshold, cooldown):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        # key -> [version, consecutive failures, monotonic time the circuit opened or None]
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key, version):
+        state = self._state.get(key)
+        if state is not None and state[0] != version:
+            del self._state[key]
+            return None
+        return state
+
+    def allow(self, key, version=None):
+        """Whether a call may be made now"""
+        with self._lock:
+            state = self._get(key, version)
+            if state is None or state[2] is None:
+                return True
+            now = time.monotonic()
+            if now - state[2] < self.cooldown:
+                return False
+            # Half-open: let this call probe and keep failing the others fast
+            state[2] = now
+            return True
+
+    def record_success(self, key):
+        with self._lock:
+            self._state.pop(key, None)
+
+    def record_failure(self, key, version=None):
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            state = self._get(key, version)
+            if state is None:
+                state = self._state[key] = [version, 0, None]
+            state[1] += 1
+            if state[1] >= self.failure_threshold:
+                state[2] = time.monotonic()
+
+    def reset(self, key=None):
+        """Close the circuit of one key, or of all of them"""
+        with self._lock:
+            if key is None:
+                self._state.clear()
+            else:
+                self._state.pop(key, None)
+
+
+breaker = CircuitBreaker(
+    failure_threshold=settings.WORKFLOW_CIRCUIT_FAILURE_THRESHOLD,
+    cooldown=settings.WORKFLOW_CIRCUIT_COOLDOWN,
+)
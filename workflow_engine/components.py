@@ -0,0 +1,32 @@
+"""
+Registry of the callables that implement workflow components.
+
+A handler receives the component's input and its merged configuration and
+returns the component output. Handlers are looked up by the ``handler`` key
+of the component configuration first and fall back to the AI component type.
+"""
+
+_handlers = {}
+
+
+def register_handler(name):
+    """Register the decorated callable as the handler for ``name``"""
+    def decorator(func):
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def get_handler(component_type, configuration=None):
+    """Return the handler for a component, defaulting to a passthrough"""
+    name = (configuration or {}).get('handler')
+    if name:
+        if name not in _handlers:
+            raise KeyError(f"Unknown component handler '{name}'")
+        return _handlers[name]
+    return _handlers.get(component_type, passthrough)
+
+
+def passthrough(input_data, configuration):
+    return input_data
+
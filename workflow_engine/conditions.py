@@ -0,0 +1,217 @@
+"""
+Expression language for ``ComponentConnection.condition``.
+
+Conditions are JSON documents compiled once into nested Python closures that
+are then called with a component output (a "record"):
+
+    {"var": "customer.tier"}                   path lookup, missing -> None
+    {"exists": "customer.email"}               path is present
+    {"==": [{"var": "status"}, "ok"]}          also !=, <, <=, >, >=
+    {"in": [{"var": "country"}, ["DE", "FR"]]} membership, also "not_in"
+    {"and": [...]}, {"or": [...]}, {"not": ...}
+
+A top-level mapping is shorthand for equality on every key, e.g.
+``{"status": "ok", "retry": false}``, unless it has a single key naming an
+operator. A single field named like an operator is compared with the
+explicit form, ``{"==": [{"var": "in"}, "x"]}``. A null or empty condition
+always matches; other literals such as ``false`` or ``0`` match by truthiness.
+"""
+import json
+import operator
+
+from .cache import LRUCache
+
+_MISSING = object()
+
+_compiled = LRUCache(maxsize=1024)
+
+
+class ConditionError(ValueError):
+    """Raised when a condition expression is malformed"""
+
+
+def _always(record):
+    return True
+
+
+def _constant(value):
+    return lambda record: value
+
+
+def _compile_path(path):
+    if not isinstance(path, str):
+        raise ConditionError(f"Path must be a string, got {path!r}")
+    parts = tuple(part for part in path.split('.') if part)
+
+    def lookup(record):
+        value = record
+        for part in parts:
+            if isinstance(value, dict):
+                value = value.get(part, _MISSING)
+            elif isinstance(value, list) and part.lstrip('-').isdigit():
+                index = int(part)
+                value = value[index] if -len(value) <= index < len(value) else _MISSING
+            else:
+                return _MISSING
+            if value is _MISSING:
+                return _MISSING
+        return value
+    return lookup
+
+
+def _compile_var(args):
+    default = None
+    if isinstance(args, list):
+        if not 1 <= len(args) <= 2:
+            raise ConditionError("'var' takes a path and an optional default")
+        path, default = args[0], args[1] if len(args) == 2 else None
+    else:
+        path = args
+    lookup = _compile_path(path)
+
+    def var(record):
+        value = lookup(record)
+        return default if value is _MISSING else value
+    return var
+
+
+def _compile_exists(args):
+    lookup = _compile_path(args)
+    return lambda record: lookup(record) is not _MISSING
+
+
+def _binary_args(name, args):
+    if not isinstance(args, list) or len(args) != 2:
+        raise ConditionError(f"'{name}' takes exactly two arguments")
+    return _compile(args[0]), _compile(args[1])
+
+
+def _comparison(name, compare):
+    def build(args):
+        left, right = _binary_args(name, args)
+
+        def evaluate(record):
+            try:
+                return compare(left(record), right(record))
+            except TypeError:
+                # Ordering between incompatible types never matches
+                return False
+        return evaluate
+    return build
+
+
+def _membership(negate):
+    name = 'not_in' if negate else 'in'
+
+    def build(args):
+        if not isinstance(args, list) or len(args) != 2:
+            raise ConditionError(f"'{name}' takes exactly two arguments")
+        needle = _compile(args[0])
+        haystack = args[1]
+        if isinstance(haystack, list):
+            # Literal collections are frozen once for constant-time lookups
+            try:
+                members = frozenset(haystack)
+            except TypeError:
+                members = tuple(haystack)
+
+            def contains(record):
+                try:
+                    return needle(record) in members
+                except TypeError:
+                    return False
+        else:
+            container = _compile(haystack)
+
+            def contains(record):
+                try:
+                    return needle(record) in container(record)
+                except TypeError:
+                    return False
+        if negate:
+            return lambda record: not contains(record)
+        return contains
+    return build
+
+
+def _compile_and(args):
+    if not isinstance(args, list) or not args:
+        raise ConditionError("'and' takes a non-empty list")
+    clauses = tuple(_compile(arg) for arg in args)
+    return lambda record: all(clause(record) for clause in clauses)
+
+
+def _compile_or(args):
+    if not isinstance(args, list) or not args:
+        raise ConditionError("'or' takes a non-empty list")
+    clauses = tuple(_compile(arg) for arg in args)
+    return lambda record: any(clause(record) for clause in clauses)
+
+
+def _compile_not(args):
+    if isinstance(args, list):
+        if len(args) != 1:
+            raise ConditionError("'not' takes a single argument")
+        args = args[0]
+    clause = _compile(args)
+    return lambda record: not clause(record)
+
+
+_OPERATORS = {
+    'var': _compile_var,
+    'exists': _compile_exists,
+    '==': _comparison('==', operator.eq),
+    '!=': _comparison('!=', operator.ne),
+    '<': _comparison('<', operator.lt),
+    '<=': _comparison('<=', operator.le),
+    '>': _comparison('>', operator.gt),
+    '>=': _comparison('>=', operator.ge),
+    'in': _membership(negate=False),
+    'not_in': _membership(negate=True),
+    'and': _compile_and,
+    'or': _compile_or,
+    'not': _compile_not,
+}
+
+
+def _compile(expression):
+    if isinstance(expression, dict):
+        if len(expression) != 1:
+            raise ConditionError(f"Expected a single operator, got {sorted(expression)}")
+        (name, args), = expression.items()
+        if name not in _OPERATORS:
+            raise ConditionError(f"Unknown operator '{name}'")
+        return _OPERATORS[name](args)
+    if isinstance(expression, list):
+        items = tuple(_compile(item) for item in expression)
+        return lambda record: [item(record) for item in items]
+    return _constant(expression)
+
+
+def _compile_root(condition):
+    if condition is None or condition == {}:
+        return _always
+    if isinstance(condition, dict) and not (len(condition) == 1 and next(iter(condition)) in _OPERATORS):
+        checks = tuple((_compile_path(path), value) for path, value in condition.items())
+        return lambda record: all(lookup(record) == value for lookup, value in checks)
+    predicate = _compile(condition)
+    return lambda record: bool(predicate(record))
+
+
+def compile_condition(condition):
+    """Compile ``condition`` into a predicate taking a single record"""
+    try:
+        key = json.dumps(condition, sort_keys=True)
+    except (TypeError, ValueError) as e:
+        raise ConditionError(str(e))
+    predicate = _compiled.get(key)
+    if predicate is None:
+        predicate = _compile_root(condition)
+        _compiled.set(key, predicate)
+    return predicate
+
+
+def evaluate_batch(condition, records):
+    """Evaluate ``condition`` against every record, returning a list of booleans"""
+    predicate = compile_condition(condition)
+    return [predicate(record) for record in records]
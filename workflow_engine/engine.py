@@ -0,0 +1,301 @@
+"""
+DAG execution engine for workflows.
+
+The engine takes the compiled plan of a workflow (see plans.py), schedules
+its components in topological order and runs independent branches
+concurrently on a bounded thread pool. All database writes happen on the
+scheduling thread; worker threads only run component handlers.
+
+An execution that resumes a failed one reuses the outputs its completed
+components produced there, so only the failed components and everything
+downstream of them run again.
+
+Each component runs under the ``timeout``, ``max_retries`` and
+``retry_backoff`` of its configuration (see timeouts.py), and behind the
+circuit breaker of its AI component (see circuits.py). A timed out attempt
+is only retried when the component is marked ``idempotent``.
+"""
+import copy
+import heapq
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from .circuits import CircuitOpenError, breaker
+from .components import get_handler
+from .log_writer import BufferedLogWriter
+from .memo import MISS, get_result, result_key, store_result
+from .models import ComponentExecutionLog, WorkflowExecution
+from .payloads import REFERENCE_KEY, is_reference, load_many, offload, resolve
+from .plans import get_execution_plan
+from .timeouts import ComponentTimeoutError, TooManyAbandonedError, call_with_timeout
+
+logger = logging.getLogger(__name__)
+
+
+def _run_component(node, input_data):
+    """Run a node's handler, retrying failures with exponential backoff"""
+    try:
+        handler = get_handler(node.component_type, node.configuration)
+        attempt = 0
+        while True:
+            if not breaker.allow(node.ai_component_id, node.ai_component_version):
+                raise CircuitOpenError(
+                    f"AI component {node.ai_component_id} failed repeatedly and is paused"
+                )
+            try:
+                # Plans are shared between runs and payloads between branches,
+                # so every attempt gets its own copies
+                output = call_with_timeout(
+                    node.timeout, handler, copy.deepcopy(input_data), copy.deepcopy(node.configuration)
+                )
+            except TooManyAbandonedError:
+                raise
+            except Exception as e:
+                breaker.record_failure(node.ai_component_id, node.ai_component_version)
+                if attempt >= node.max_retries:
+                    raise
+                # A timed out handler may still be running and must not run twice at once
+                if isinstance(e, ComponentTimeoutError) and not node.idempotent:
+                    raise
+                delay = min(node.retry_backoff * 2 ** attempt, settings.WORKFLOW_COMPONENT_MAX_BACKOFF)
+                attempt += 1
+                logger.info("Retrying component %s in %.1fs (attempt %s of %s): %s",
+                            node.id, delay, attempt, node.max_retries, e)
+                time.sleep(delay)
+            else:
+                breaker.record_success(node.ai_component_id)
+                return output
+    finally:
+        # Handlers may touch the database from this worker thread
+        connections.close_all()
+
+
+def _merge_inputs(inputs, position):
+    """Combine the payloads of all activated parents in topological order"""
+    payloads = [inputs[source] for source in sorted(inputs, key=lambda s: position.get(s, -1))]
+    if len(payloads) == 1:
+        return payloads[0]
+    if all(isinstance(payload, dict) for payload in payloads):
+        merged = {}
+        for payload in payloads:
+            merged.update(payload)
+        return merged
+    return payloads
+
+
+def _reusable_outputs(graph, execution_id):
+    """
+    Outputs a resumption may take over from execution ``execution_id``: those
+    of components that completed there and are not downstream of a component
+    that failed, was interrupted or has changed since.
+    """
+    logs = ComponentExecutionLog.objects.filter(
+        workflow_execution_id=execution_id, workflow_component_id__in=graph.nodes
+    ).values_list('workflow_component_id', 'status', 'output_data', 'fingerprint')
+    completed, stack = {}, []
+    for node_id, status, output, fingerprint in logs:
+        if status == 'COMPLETED' and fingerprint == graph.fingerprints[node_id]:
+            completed[node_id] = output
+        else:
+            stack.append(node_id)
+
+    tainted = set()
+    while stack:
+        node_id = stack.pop()
+        if node_id not in tainted:
+            tainted.add(node_id)
+            stack.extend(edge.target for edge in graph.outgoing[node_id])
+
+    outputs = {node_id: output for node_id, output in completed.items() if node_id not in tainted}
+    loaded = load_many(output[REFERENCE_KEY] for output in outputs.values() if is_reference(output))
+    return {node_id: resolve(output, loaded) for node_id, output in outputs.items()}
+
+
+class _GraphRun:
+    """State of a single execution of a workflow graph"""
+
+    def __init__(self, graph, execution, max_workers, reused=None, heartbeat=None):
+        self.graph = graph
+        self.execution = execution
+        self.max_workers = max_workers
+        # Outputs taken over from the execution being resumed, by node
+        self.reused = reused or {}
+        self.remaining = {node_id: len(edges) for node_id, edges in graph.incoming.items()}
+        self.inputs = {node_id: {} for node_id in graph.nodes}
+        self.activated = set()
+        self.results = {}
+        self.errors = []
+        self.ready = []
+        self.logs = BufferedLogWriter()
+        self.heartbeat = heartbeat
+        self.next_heartbeat = time.monotonic() + settings.WORKFLOW_HEARTBEAT_INTERVAL
+
+    def execute(self):
+        input_data = resolve(self.execution.input_data)
+        for node_id in self.graph.roots():
+            self.inputs[node_id][None] = input_data
+            self.activated.add(node_id)
+            heapq.heappush(self.ready, (self.graph.position[node_id], node_id))
+
+        running = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers,
+                                    thread_name_prefix='workflow') as pool:
+                while self.ready or running:
+                    # Stop scheduling new components once a failure went unhandled
+                    while self.ready and not self.errors:
+                        _, node_id = heapq.heappop(self.ready)
+                        node = self.graph.nodes[node_id]
+                        input_data = _merge_inputs(self.inputs[node_id], self.graph.position)
+                        log = ComponentExecutionLog(
+                            workflow_execution=self.execution,
+                            workflow_component_id=node_id,
+                            status='RUNNING',
+                            input_data=copy.deepcopy(input_data),
+                            started_at=timezone.now(),
+                            fingerprint=self.graph.fingerprints[node_id]
+                        )
+                        self.logs.add(log)
+                        key = None
+                        cached = self.reused.get(node_id, MISS)
+                        if cached is MISS and node.cacheable:
+                            key = result_key(node, input_data)
+                            cached = get_result(key)
+                        if cached is not MISS:
+                            self._record(node, log, input_data, output=cached)
+                            continue
+                        future = pool.submit(_run_component, node, input_data)
+                        running[future] = (node, log, input_data, key)
+
+                    if not running:
+                        break
+
+                    # Wake up for time-based log flushes and heartbeats while components run
+                    done, _ = wait(running, timeout=self._wait_timeout(), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        node, log, input_data, key = running.pop(future)
+                        try:
+                            output = future.result()
+                        except Exception as e:
+                            self._record(node, log, input_data, error=e)
+                        else:
+                            if key:
+                                store_result(key, output)
+                            self._record(node, log, input_data, output=output)
+                    self.logs.flush_if_due()
+                    self._beat()
+        finally:
+            self.logs.flush()
+
+        outputs = {
+            str(node_id): self.results[node_id]
+            for node_id in self.graph.sinks() if node_id in self.results
+        }
+        return outputs, self.errors
+
+    def _wait_timeout(self):
+        timeout = self.logs.timeout()
+        if self.heartbeat is None:
+            return timeout
+        until_heartbeat = max(self.next_heartbeat - time.monotonic(), 0)
+        return until_heartbeat if timeout is None else min(timeout, until_heartbeat)
+
+    def _beat(self):
+        if self.heartbeat is not None and time.monotonic() >= self.next_heartbeat:
+            self.heartbeat()
+            self.next_heartbeat = time.monotonic() + settings.WORKFLOW_HEARTBEAT_INTERVAL
+
+    def _record(self, node, log, input_data, output=None, error=None):
+        if error is not None:
+            logger.warning("Component %s of execution %s failed: %s",
+                           node.id, self.execution.id, error)
+            log.status = 'FAILED'
+            log.error_message = str(error)
+            payload = {'error': str(error), 'component': node.id, 'input': input_data}
+            outcome = 'FAILED'
+            if not any(edge.connection_type == 'FAILURE' for edge in self.graph.outgoing[node.id]):
+                self.errors.append(f"Component {node.id} failed: {error}")
+        else:
+            log.status = 'COMPLETED'
+            log.output_data = output
+            payload = output
+            outcome = 'COMPLETED'
+            self.results[node.id] = output
+
+        log.completed_at = timezone.now()
+        self.logs.update(log)
+        self._resolve(node.id, outcome, payload)
+
+    def _edge_fires(self, edge, outcome, payload):
+        if outcome == 'FAILED':
+            return edge.connection_type == 'FAILURE'
+        if outcome != 'COMPLETED':
+            return False
+        if edge.connection_type == 'SUCCESS':
+            return True
+        if edge.connection_type == 'CONDITIONAL':
+            return edge.predicate(payload)
+        return False
+
+    def _resolve(self, node_id, outcome, payload):
+        """Propagate a node's outcome along its edges, skipping unreachable nodes"""
+        stack = [(node_id, outcome, payload)]
+        while stack:
+            source, outcome, payload = stack.pop()
+            for edge in self.graph.outgoing[source]:
+                target = edge.target
+                if self._edge_fires(edge, outcome, payload):
+                    self.activated.add(target)
+                    self.inputs[target][source] = payload
+                self.remaining[target] -= 1
+                if self.remaining[target]:
+                    continue
+                if target in self.activated:
+                    heapq.heappush(self.ready, (self.graph.position[target], target))
+                else:
+                    stack.append((target, 'SKIPPED', None))
+
+
+class WorkflowEngine:
+    """Runs workflow executions on a bounded pool of worker threads"""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or settings.WORKFLOW_ENGINE_MAX_WORKERS
+
+    def run(self, execution, heartbeat=None):
+        """Run ``execution``, calling ``heartbeat`` periodically while it runs"""
+        if execution.status != 'RUNNING':
+            execution.status = 'RUNNING'
+            execution.heartbeat_at = timezone.now()
+            execution.save(update_fields=['status', 'heartbeat_at'])
+
+        output, errors = None, []
+        try:
+            graph = get_execution_plan(execution.workflow)
+            reused = None
+            if execution.resumed_from_id:
+                reused = _reusable_outputs(graph, execution.resumed_from_id)
+            output, errors = _GraphRun(graph, execution, self.max_workers, reused, heartbeat).execute()
+        except Exception as e:
+            logger.exception("Execution %s of workflow %s failed", execution.id, execution.workflow_id)
+            errors = [str(e)]
+
+        outcome = {
+            'status': 'FAILED' if errors else 'COMPLETED',
+            'output_data': offload(output),
+            'error_message': '\n'.join(errors) or None,
+            'completed_at': timezone.now(),
+        }
+        # The lease may have expired meanwhile, and the execution been failed and resumed
+        if WorkflowExecution.objects.filter(pk=execution.pk, status='RUNNING').update(**outcome):
+            for field, value in outcome.items():
+                setattr(execution, field, value)
+        else:
+            logger.warning("Execution %s is no longer running; discarding its outcome", execution.id)
+            execution.refresh_from_db()
+        return execution
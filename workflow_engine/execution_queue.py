@@ -0,0 +1,126 @@
+"""
+Database-backed queue of workflow executions.
+
+PENDING WorkflowExecution rows form the queue. Workers claim them with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of worker processes on any
+number of hosts can drain it without an external broker. Databases without
+row locks (SQLite) fall back to a compare-and-set update per row.
+
+A claimed execution is leased to its worker, which renews ``heartbeat_at``
+every WORKFLOW_HEARTBEAT_INTERVAL seconds while it runs or waits its turn.
+When a worker dies, its executions stop being renewed and ``fail_expired``
+marks them FAILED after WORKFLOW_LEASE_TIMEOUT seconds, from where they can
+be resumed.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .engine import WorkflowEngine
+from .models import WorkflowExecution
+
+logger = logging.getLogger(__name__)
+
+LEASE_EXPIRED_MESSAGE = 'The worker running this execution stopped; resume it to continue'
+
+
+def _pending():
+    return WorkflowExecution.objects.filter(status='PENDING').order_by('started_at', 'id')
+
+
+def _claim_locked(limit):
+    with transaction.atomic():
+        executions = list(
+            _pending()
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('workflow')[:limit]
+        )
+        if executions:
+            WorkflowExecution.objects.filter(
+                pk__in=[execution.pk for execution in executions]
+            ).update(status='RUNNING', heartbeat_at=timezone.now())
+    return executions
+
+
+def _claim_optimistic(limit):
+    executions = []
+    for execution in _pending().select_related('workflow')[:limit]:
+        # Another worker may have claimed the row since it was read
+        claimed = WorkflowExecution.objects.filter(pk=execution.pk, status='PENDING').update(
+            status='RUNNING', heartbeat_at=timezone.now()
+        )
+        if claimed:
+            executions.append(execution)
+    return executions
+
+
+def claim_executions(limit=1):
+    """Atomically move up to ``limit`` PENDING executions to RUNNING and return them"""
+    if connection.features.has_select_for_update_skip_locked:
+        executions = _claim_locked(limit)
+    else:
+        executions = _claim_optimistic(limit)
+    for execution in executions:
+        execution.status = 'RUNNING'
+    return executions
+
+
+def renew_leases(execution_ids):
+    """Extend the lease of executions this worker still holds"""
+    try:
+        WorkflowExecution.objects.filter(pk__in=execution_ids, status='RUNNING').update(
+            heartbeat_at=timezone.now()
+        )
+    except DatabaseError:
+        logger.warning("Failed to renew the lease of executions %s", execution_ids, exc_info=True)
+
+
+def release_executions(executions):
+    """Put claimed executions that were not started back in the queue"""
+    WorkflowExecution.objects.filter(
+        pk__in=[execution.pk for execution in executions], status='RUNNING'
+    ).update(status='PENDING', heartbeat_at=None)
+
+
+def fail_expired():
+    """Fail RUNNING executions whose lease has expired, returning how many there were"""
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.WORKFLOW_LEASE_TIMEOUT)
+    return WorkflowExecution.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True), status='RUNNING'
+    ).update(status='FAILED', error_message=LEASE_EXPIRED_MESSAGE, completed_at=now)
+
+
+def _record_failure(execution, error):
+    try:
+        WorkflowExecution.objects.filter(pk=execution.pk, status='RUNNING').update(
+            status='FAILED', error_message=str(error), completed_at=timezone.now()
+        )
+    except DatabaseError:
+        # The lease expires and fail_expired records it instead
+        logger.warning("Failed to record the failure of execution %s", execution.pk, exc_info=True)
+
+
+def run_pending(limit=1, engine=None, should_stop=None):
+    """
+    Claim and run pending executions, returning how many were claimed.
+    Once ``should_stop()`` is true, executions not started yet are released.
+    """
+    engine = engine or WorkflowEngine()
+    executions = claim_executions(limit)
+    for index, execution in enumerate(executions):
+        if should_stop is not None and should_stop():
+            release_executions(executions[index:])
+            break
+        # Executions waiting their turn keep their lease too
+        held = [claimed.pk for claimed in executions[index:]]
+        try:
+            engine.run(execution, heartbeat=lambda: renew_leases(held))
+        except Exception as e:
+            logger.exception("Failed to run execution %s", execution.pk)
+            _record_failure(execution, e)
+    return len(executions)
@@ -0,0 +1,83 @@
+"""
+Buffered writes of ComponentExecutionLog rows.
+
+The engine records a log when a component starts and completes it when the
+component finishes. Instead of an INSERT and an UPDATE per component, the
+writer keeps pending rows in memory and applies them with one bulk_create and
+one bulk_update when the buffer reaches WORKFLOW_LOG_FLUSH_SIZE entries or is
+older than WORKFLOW_LOG_FLUSH_INTERVAL seconds. A log that completes before
+it was flushed is inserted once, already in its final state. Large inputs
+and outputs are offloaded to the payload store while flushing.
+"""
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import ComponentExecutionLog
+from .payloads import offload_many
+
+UPDATE_FIELDS = ['status', 'output_data', 'error_message', 'completed_at']
+
+
+class BufferedLogWriter:
+    def __init__(self, max_size=None, interval=None):
+        self.max_size = max_size or settings.WORKFLOW_LOG_FLUSH_SIZE
+        self.interval = settings.WORKFLOW_LOG_FLUSH_INTERVAL if interval is None else interval
+        self._creates = []
+        self._updates = {}
+        self._first_pending_at = None
+
+    def __len__(self):
+        return len(self._creates) + len(self._updates)
+
+    def _pending(self):
+        if self._first_pending_at is None:
+            self._first_pending_at = time.monotonic()
+        if len(self) >= self.max_size:
+            self.flush()
+
+    def add(self, log):
+        """Queue the insert of a new log"""
+        self._creates.append(log)
+        self._pending()
+
+    def update(self, log):
+        """Queue the completion of a log; unflushed logs are simply inserted later"""
+        if log.pk is not None:
+            self._updates[log.pk] = log
+            self._pending()
+
+    def timeout(self):
+        """Seconds until the buffer is due for flushing, or None when it is empty"""
+        if self._first_pending_at is None:
+            return None
+        return max(self._first_pending_at + self.interval - time.monotonic(), 0)
+
+    def flush_if_due(self):
+        if self.timeout() == 0:
+            self.flush()
+
+    def flush(self):
+        creates, updates = self._creates, list(self._updates.values())
+        self._creates, self._updates, self._first_pending_at = [], {}, None
+        if not creates and not updates:
+            return
+        logs = creates + updates
+        # Parents' outputs are their children's inputs and are stored only once.
+        # Inputs of already inserted logs hold their stored value by now.
+        values = offload_many(
+            [log.input_data for log in creates] + [log.output_data for log in logs]
+        )
+        for log, input_data in zip(creates, values[:len(creates)]):
+            log.input_data = input_data
+        for log, output_data in zip(logs, values[len(creates):]):
+            log.output_data = output_data
+        with transaction.atomic():
+            if connection.features.can_return_rows_from_bulk_insert:
+                ComponentExecutionLog.objects.bulk_create(creates)
+            else:
+                # Later updates need the primary keys of the inserted rows
+                for log in creates:
+                    log.save()
+            ComponentExecutionLog.objects.bulk_update(updates, UPDATE_FIELDS)
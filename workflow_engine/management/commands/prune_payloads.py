@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from workflow_engine.models import Payload
+from workflow_engine.payloads import referenced_digests
+
+
+class Command(BaseCommand):
+    help = 'Deletes stored payloads that are no longer referenced by any execution or log'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-age', type=float, default=24,
+                            help='Hours a payload is kept regardless, covering rows still being written')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Payloads deleted per query')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many payloads would be deleted')
+
+    def handle(self, *args, **options):
+        # Candidates are read before the references, so rows written in between are seen
+        cutoff = timezone.now() - timedelta(hours=options['min_age'])
+        candidates = list(Payload.objects.filter(created_at__lt=cutoff).values_list('digest', flat=True))
+        referenced = referenced_digests()
+        orphans = [digest for digest in candidates if digest not in referenced]
+
+        if not options['dry_run']:
+            batch_size = options['batch_size']
+            for start in range(0, len(orphans), batch_size):
+                # Payloads stored again since they were read have a newer created_at
+                Payload.objects.filter(
+                    digest__in=orphans[start:start + batch_size], created_at__lt=cutoff
+                ).delete()
+
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {len(orphans)} of {len(candidates)} payload(s)'))
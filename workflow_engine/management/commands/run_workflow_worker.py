@@ -0,0 +1,91 @@
+import logging
+import multiprocessing
+import signal
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections, connections
+
+logger = logging.getLogger(__name__)
+
+
+def work(batch_size, poll_interval, once):
+    """
+    Claim and run executions until interrupted, or until the queue is empty
+    with ``once``. SIGTERM lets the current execution finish before exiting.
+    """
+    import django
+    django.setup()
+    from workflow_engine.execution_queue import fail_expired, run_pending
+
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+    next_sweep = 0
+
+    try:
+        while not stopping.is_set():
+            close_old_connections()
+            try:
+                if time.monotonic() >= next_sweep:
+                    next_sweep = time.monotonic() + settings.WORKFLOW_HEARTBEAT_INTERVAL
+                    expired = fail_expired()
+                    if expired:
+                        logger.warning("Failed %s execution(s) whose worker stopped", expired)
+                if run_pending(limit=batch_size, should_stop=stopping.is_set):
+                    continue
+            except DatabaseError:
+                logger.exception("Failed to claim workflow executions")
+            if once:
+                break
+            stopping.wait(poll_interval)
+    except KeyboardInterrupt:
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Runs queued workflow executions until interrupted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1,
+                            help='Number of executions claimed per poll')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to wait when the queue is empty')
+        parser.add_argument('--processes', type=int, default=settings.WORKFLOW_WORKER_PROCESSES,
+                            help='Number of worker processes draining the queue')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit as soon as the queue is empty')
+
+    def handle(self, *args, **options):
+        worker_args = (options['batch_size'], options['poll_interval'], options['once'])
+        processes = max(1, options['processes'])
+        self.stdout.write(self.style.SUCCESS(f'Workflow worker started with {processes} process(es)'))
+
+        if processes == 1:
+            work(*worker_args)
+        else:
+            # Children must not inherit the parent's database connections
+            connections.close_all()
+            children = [
+                multiprocessing.Process(target=work, args=worker_args, name=f'workflow-worker-{index}')
+                for index in range(processes)
+            ]
+            for child in children:
+                child.start()
+
+            def stop_children(signum, frame):
+                # Children finish their current execution on SIGTERM
+                for child in children:
+                    if child.is_alive():
+                        child.terminate()
+
+            signal.signal(signal.SIGTERM, stop_children)
+            try:
+                for child in children:
+                    child.join()
+            except KeyboardInterrupt:
+                for child in children:
+                    child.join()
+
+        self.stdout.write(self.style.SUCCESS('Workflow worker stopped'))
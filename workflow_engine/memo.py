@@ -0,0 +1,50 @@
+"""
+Memoized outputs of cacheable components.
+
+Components whose AIComponent is marked ``is_cacheable`` are pure functions
+of their input and configuration, so their outputs are kept in a bounded,
+expiring in-process cache keyed by a hash of (AI component, its version,
+configuration, input). Editing an AI component changes its version, so every
+worker process stops serving the outputs of the old one. Outputs are stored JSON-encoded, which keeps them compact and gives
+every hit its own copy.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .cache import TTLCache
+
+MISS = object()
+
+_results = TTLCache(maxsize=settings.WORKFLOW_RESULT_CACHE_SIZE, ttl=settings.WORKFLOW_RESULT_CACHE_TTL)
+
+
+def result_key(node, input_data):
+    """Cache key of running ``node`` on ``input_data``, or None if the input cannot be hashed"""
+    try:
+        encoded = json.dumps(
+            [node.ai_component_id, node.ai_component_version, node.component_type,
+             node.configuration, input_data],
+            cls=DjangoJSONEncoder, sort_keys=True, separators=(',', ':')
+        )
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def get_result(key):
+    encoded = _results.get(key)
+    return MISS if encoded is None else json.loads(encoded)
+
+
+def store_result(key, output):
+    try:
+        _results.set(key, json.dumps(output, cls=DjangoJSONEncoder))
+    except (TypeError, ValueError):
+        pass
+
+
+def clear_results():
+    _results.clear()
@@ -0,0 +1,66 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_organization(apps, schema_editor):
+    User = apps.get_model('accounts', 'CustomUser')
+    Workflow = apps.get_model('workflow_engine', 'Workflow')
+    user_organization = User.objects.filter(pk=OuterRef('created_by_id')).values('organization_id')[:1]
+    for model_name in ('AIComponent', 'Workflow'):
+        apps.get_model('workflow_engine', model_name).objects.filter(
+            organization__isnull=True
+        ).update(organization_id=Subquery(user_organization))
+
+    workflow_organization = Workflow.objects.filter(pk=OuterRef('workflow_id')).values('organization_id')[:1]
+    for model_name in ('WorkflowComponent', 'ComponentConnection', 'WorkflowExecution'):
+        apps.get_model('workflow_engine', model_name).objects.filter(
+            organization__isnull=True
+        ).update(organization_id=Subquery(workflow_organization))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_remove_informaticacredentials_user'),
+        ('workflow_engine', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aicomponent',
+            name='organization',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='accounts.organization'),
+        ),
+        migrations.AddField(
+            model_name='componentconnection',
+            name='organization',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='accounts.organization'),
+        ),
+        migrations.AddField(
+            model_name='workflow',
+            name='organization',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='accounts.organization'),
+        ),
+        migrations.AddField(
+            model_name='workflowcomponent',
+            name='organization',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='accounts.organization'),
+        ),
+        migrations.AddField(
+            model_name='workflowexecution',
+            name='organization',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='accounts.organization'),
+        ),
+        migrations.RunPython(backfill_organization, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='workflowexecution',
+            index=models.Index(fields=['organization', '-started_at'], name='execution_org_started_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowexecution',
+            index=models.Index(fields=['organization', 'status'], name='execution_org_status_idx'),
+        ),
+    ]
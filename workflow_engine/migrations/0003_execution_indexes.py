@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_remove_informaticacredentials_user'),
+        ('workflow_engine', '0002_organization'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='componentexecutionlog',
+            index=models.Index(fields=['workflow_execution', 'started_at'], name='log_execution_started_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowexecution',
+            index=models.Index(fields=['workflow', 'status', 'started_at'], name='execution_workflow_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowexecution',
+            index=models.Index(fields=['status', 'started_at'], name='execution_status_started_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workflow_engine', '0003_execution_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='componentexecutionlog',
+            name='started_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
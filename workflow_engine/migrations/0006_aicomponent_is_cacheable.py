@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workflow_engine', '0005_payload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aicomponent',
+            name='is_cacheable',
+            field=models.BooleanField(default=False, help_text='Output depends only on input and configuration, so results can be reused'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workflow_engine', '0006_aicomponent_is_cacheable'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workflowexecution',
+            name='resumed_from',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='resumptions', to='workflow_engine.workflowexecution'),
+        ),
+    ]
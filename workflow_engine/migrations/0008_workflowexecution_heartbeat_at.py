@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_remove_informaticacredentials_user'),
+        ('workflow_engine', '0007_workflowexecution_resumed_from'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workflowexecution',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='Last time the worker running this execution renewed its lease', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='workflowexecution',
+            index=models.Index(fields=['status', 'heartbeat_at'], name='execution_status_heartbeat_idx'),
+        ),
+    ]
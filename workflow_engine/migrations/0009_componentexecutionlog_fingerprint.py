@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workflow_engine', '0008_workflowexecution_heartbeat_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='componentexecutionlog',
+            name='fingerprint',
+            field=models.CharField(blank=True, default='', help_text="Hash of the component's configuration and incoming connections when it ran", max_length=64),
+        ),
+    ]
@@ -0,0 +1,86 @@
+"""
+Reusable viewset mixins.
+"""
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, RelatedField
+from rest_framework.response import Response
+
+
+def eager_loading_paths(serializer, prefix='', in_prefetch=False):
+    """
+    Walk a serializer's readable fields and return the ``(select_related,
+    prefetch_related)`` lookups needed to render it without extra queries.
+    """
+    select_related, prefetch_related = [], []
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        path = prefix + field.source.replace('.', '__')
+        if isinstance(field, serializers.ListSerializer):
+            prefetch_related.append(path)
+            nested = eager_loading_paths(field.child, path + '__', in_prefetch=True)
+        elif isinstance(field, serializers.BaseSerializer):
+            (prefetch_related if in_prefetch else select_related).append(path)
+            nested = eager_loading_paths(field, path + '__', in_prefetch)
+        elif isinstance(field, ManyRelatedField):
+            prefetch_related.append(path)
+            continue
+        elif isinstance(field, RelatedField) and not field.use_pk_only_optimization():
+            (prefetch_related if in_prefetch else select_related).append(path)
+            continue
+        else:
+            continue
+        select_related.extend(nested[0])
+        prefetch_related.extend(nested[1])
+    return select_related, prefetch_related
+
+
+class EagerLoadingMixin:
+    """
+    Applies the select_related/prefetch_related lookups required by the
+    viewset's serializer, so nested representations cost a fixed number of
+    queries regardless of page size.
+    """
+    _eager_loading_cache = {}
+
+    def get_eager_loading_paths(self):
+        serializer_class = self.get_serializer_class()
+        if serializer_class not in self._eager_loading_cache:
+            self._eager_loading_cache[serializer_class] = eager_loading_paths(serializer_class())
+        return self._eager_loading_cache[serializer_class]
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        select_related, prefetch_related = self.get_eager_loading_paths()
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+class SummaryListMixin:
+    """
+    ``?view=summary`` lists only the scalar columns named in
+    ``summary_fields``, read with ``.values()`` so that no serializer or
+    related object is involved. Detail routes keep the full representation.
+    """
+    summary_fields = ()
+
+    def is_summary_view(self):
+        return bool(self.summary_fields) and self.request.query_params.get('view') == 'summary'
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_summary_view():
+            return super().list(request, *args, **kwargs)
+
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .select_related(None)
+            .prefetch_related(None)
+            .values(*self.summary_fields)
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(queryset))
@@ -1,7 +1,27 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
-class AIComponent(models.Model):
+class OrganizationScopedModel(models.Model):
+    """
+    Stores the owning organization on the row itself so tenant-scoped queries
+    filter on an indexed column instead of joining through users and
+    workflows. It is copied from ``organization_source`` on creation.
+    """
+    organization = models.ForeignKey('accounts.Organization', on_delete=models.CASCADE,
+                                     null=True, blank=True, related_name='+')
+
+    organization_source = None
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.organization_id is None:
+            self.organization_id = getattr(self, self.organization_source).organization_id
+        super().save(*args, **kwargs)
+
+class AIComponent(OrganizationScopedModel):
     name = models.CharField(max_length=255)
     description = models.TextField()
     component_type = models.CharField(max_length=50, choices=[
@@ -15,11 +35,17 @@ class AIComponent(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     is_active = models.BooleanField(default=True)
+    is_cacheable = models.BooleanField(
+        default=False,
+        help_text="Output depends only on input and configuration, so results can be reused"
+    )
+
+    organization_source = 'created_by'
 
     def __str__(self):
         return self.name
 
-class Workflow(models.Model):
+class Workflow(OrganizationScopedModel):
     name = models.CharField(max_length=255)
     description = models.TextField()
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -29,10 +55,12 @@ class Workflow(models.Model):
     is_published = models.BooleanField(default=False)
     version = models.CharField(max_length=20)
 
+    organization_source = 'created_by'
+
     def __str__(self):
         return f"{self.name} v{self.version}"
 
-class WorkflowComponent(models.Model):
+class WorkflowComponent(OrganizationScopedModel):
     workflow = models.ForeignKey(Workflow, on_delete=models.CASCADE, related_name='components')
     ai_component = models.ForeignKey(AIComponent, on_delete=models.CASCADE)
     position_x = models.FloatField(help_text="X coordinate in the workflow canvas")
@@ -40,10 +68,12 @@ class WorkflowComponent(models.Model):
     configuration = models.JSONField(help_text="Component specific configuration")
     order = models.IntegerField(help_text="Execution order in the workflow")
 
+    organization_source = 'workflow'
+
     class Meta:
         ordering = ['order']
 
-class ComponentConnection(models.Model):
+class ComponentConnection(OrganizationScopedModel):
     workflow = models.ForeignKey(Workflow, on_delete=models.CASCADE, related_name='connections')
     source_component = models.ForeignKey(WorkflowComponent, on_delete=models.CASCADE, related_name='outgoing_connections')
     target_component = models.ForeignKey(WorkflowComponent, on_delete=models.CASCADE, related_name='incoming_connections')
@@ -54,7 +84,9 @@ class ComponentConnection(models.Model):
     ])
     condition = models.JSONField(null=True, blank=True, help_text="Conditions for conditional paths")
 
-class WorkflowExecution(models.Model):
+    organization_source = 'workflow'
+
+class WorkflowExecution(OrganizationScopedModel):
     workflow = models.ForeignKey(Workflow, on_delete=models.CASCADE, related_name='executions')
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
@@ -67,11 +99,29 @@ class WorkflowExecution(models.Model):
     input_data = models.JSONField()
     output_data = models.JSONField(null=True, blank=True)
     error_message = models.TextField(null=True, blank=True)
+    resumed_from = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True, related_name='resumptions'
+    )
+    heartbeat_at = models.DateTimeField(
+        null=True, blank=True, help_text="Last time the worker running this execution renewed its lease"
+    )
+
+    organization_source = 'workflow'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['organization', '-started_at'], name='execution_org_started_idx'),
+            models.Index(fields=['organization', 'status'], name='execution_org_status_idx'),
+            models.Index(fields=['workflow', 'status', 'started_at'], name='execution_workflow_status_idx'),
+            models.Index(fields=['status', 'started_at'], name='execution_status_started_idx'),
+            models.Index(fields=['status', 'heartbeat_at'], name='execution_status_heartbeat_idx'),
+        ]
 
 class ComponentExecutionLog(models.Model):
     workflow_execution = models.ForeignKey(WorkflowExecution, on_delete=models.CASCADE, related_name='component_logs')
     workflow_component = models.ForeignKey(WorkflowComponent, on_delete=models.CASCADE)
-    started_at = models.DateTimeField(auto_now_add=True)
+    # Set when the component starts, which can be before the row is written
+    started_at = models.DateTimeField(default=timezone.now)
     completed_at = models.DateTimeField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=[
         ('PENDING', 'Pending'),
@@ -82,6 +132,20 @@ class ComponentExecutionLog(models.Model):
     input_data = models.JSONField()
     output_data = models.JSONField(null=True, blank=True)
     error_message = models.TextField(null=True, blank=True)
+    fingerprint = models.CharField(
+        max_length=64, blank=True, default='',
+        help_text="Hash of the component's configuration and incoming connections when it ran"
+    )
 
     class Meta:
         ordering = ['started_at']
+        indexes = [
+            models.Index(fields=['workflow_execution', 'started_at'], name='log_execution_started_idx'),
+        ]
+
+class Payload(models.Model):
+    """A large JSON value stored once, compressed and addressed by its sha256 (see payloads.py)"""
+    digest = models.CharField(max_length=64, primary_key=True)
+    size = models.PositiveBigIntegerField(help_text="Size of the uncompressed JSON in bytes")
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
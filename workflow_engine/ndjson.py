@@ -0,0 +1,55 @@
+"""
+Helpers for newline-delimited JSON payloads.
+"""
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+def parse_lines(lines, encoding='utf-8'):
+    """Decode an iterable of NDJSON lines, ignoring blank ones"""
+    records = []
+    for number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode(encoding)
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError as e:
+            raise ParseError(f"Invalid JSON on line {number}: {e}")
+    return records
+
+
+class NDJSONParser(BaseParser):
+    """Parses an ``application/x-ndjson`` body into a list of records"""
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        return parse_lines(stream, encoding)
+
+
+def chunks(iterable, size):
+    """Yield lists of up to ``size`` consecutive items"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def streaming_response(records, filename):
+    """Stream an iterable of records as an NDJSON attachment"""
+    encoder = DjangoJSONEncoder()
+    response = StreamingHttpResponse(
+        (encoder.encode(record) + '\n' for record in records),
+        content_type='application/x-ndjson'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
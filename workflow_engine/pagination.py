@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ExecutionCursorPagination(CursorPagination):
+    """
+    Keyset pagination for execution history, newest first. Pages are
+    addressed by an opaque ``cursor`` instead of an offset, so deep pages
+    cost the same index range scan as the first one.
+    """
+    ordering = ('-started_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,153 @@
+"""
+Content-addressed storage for large JSON payloads.
+
+Values whose JSON encoding is at least PAYLOAD_INLINE_THRESHOLD bytes are
+stored once in the Payload table, zlib-compressed and keyed by the sha256 of
+their canonical encoding. The JSON column then only holds a reference:
+
+    {"$payload": "<sha256>", "size": <uncompressed bytes>}
+
+Identical payloads, such as a component output that is also the next
+component's input, are stored once. Use ``resolve`` (or the serializers'
+PayloadField) to get the value back.
+
+Every value written to a payload column must go through ``offload_many``.
+Small dicts that could be mistaken for a reference are wrapped as
+``{"$inline": value}``, so a reference can only come from the store itself
+and never from request data. Payloads no longer referenced by any column are
+deleted by the prune_payloads command.
+"""
+import hashlib
+import json
+import re
+import zlib
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .cache import LRUCache
+from .models import Payload
+
+REFERENCE_KEY = '$payload'
+ESCAPE_KEY = '$inline'
+
+# Columns that may hold references, as (app label, model, field names)
+PAYLOAD_FIELDS = (
+    ('workflow_engine', 'WorkflowExecution', ('input_data', 'output_data')),
+    ('workflow_engine', 'ComponentExecutionLog', ('input_data', 'output_data')),
+    ('informatica_services', 'TaskExecution', ('output_data',)),
+)
+
+_DIGEST = re.compile(r'[0-9a-f]{64}')
+
+# Encoded JSON of recently loaded payloads; every caller decodes its own copy
+_resolved = LRUCache(maxsize=256)
+
+
+def is_reference(value):
+    return (
+        isinstance(value, dict) and value.keys() == {REFERENCE_KEY, 'size'}
+        and isinstance(value[REFERENCE_KEY], str) and bool(_DIGEST.fullmatch(value[REFERENCE_KEY]))
+    )
+
+
+def _is_escaped(value):
+    return isinstance(value, dict) and value.keys() == {ESCAPE_KEY}
+
+
+def _escape(value):
+    if isinstance(value, dict) and (REFERENCE_KEY in value or ESCAPE_KEY in value):
+        return {ESCAPE_KEY: value}
+    return value
+
+
+def _encode(value):
+    return json.dumps(value, cls=DjangoJSONEncoder, sort_keys=True, separators=(',', ':')).encode()
+
+
+def offload_many(values):
+    """
+    Replace every large value by a reference, storing the payloads with a
+    single insert. Small values are kept inline, escaped where needed.
+    """
+    threshold = settings.PAYLOAD_INLINE_THRESHOLD
+    results, payloads = [], {}
+    for value in values:
+        if value is None:
+            results.append(value)
+            continue
+        encoded = _encode(value)
+        if len(encoded) < threshold:
+            results.append(_escape(value))
+            continue
+        digest = hashlib.sha256(encoded).hexdigest()
+        if digest not in payloads:
+            payloads[digest] = Payload(digest=digest, size=len(encoded), data=zlib.compress(encoded))
+        results.append({REFERENCE_KEY: digest, 'size': len(encoded)})
+    if payloads:
+        # Storing an existing payload again refreshes created_at, which prune_payloads relies on
+        Payload.objects.bulk_create(
+            payloads.values(), update_conflicts=True, unique_fields=['digest'], update_fields=['created_at']
+        )
+    return results
+
+
+def offload(value):
+    """Return ``value``, or a reference to it when it is too large to inline"""
+    return offload_many([value])[0]
+
+
+def load_many(digests):
+    """Return a mapping of digest to decoded value for the given digests"""
+    found, missing = {}, []
+    for digest in set(digests):
+        encoded = _resolved.get(digest)
+        if encoded is None:
+            missing.append(digest)
+        else:
+            found[digest] = json.loads(encoded)
+    if missing:
+        for digest, data in Payload.objects.filter(digest__in=missing).values_list('digest', 'data'):
+            encoded = zlib.decompress(bytes(data))
+            _resolved.set(digest, encoded)
+            found[digest] = json.loads(encoded)
+    return found
+
+
+def resolve(value, loaded=None):
+    """Return the value a stored column value stands for"""
+    if _is_escaped(value):
+        return value[ESCAPE_KEY]
+    if not is_reference(value):
+        return value
+    digest = value[REFERENCE_KEY]
+    if loaded is not None and digest in loaded:
+        return loaded[digest]
+    return load_many([digest]).get(digest)
+
+
+def collect_references(instances, field_names):
+    """Digests referenced by ``field_names`` of the given objects"""
+    return [
+        getattr(instance, name)[REFERENCE_KEY]
+        for instance in instances for name in field_names
+        if is_reference(getattr(instance, name, None))
+    ]
+
+
+def referenced_digests():
+    """Digests referenced by any payload column"""
+    from django.apps import apps
+    from django.db.models.fields.json import KeyTextTransform
+
+    digests = set()
+    for app_label, model_name, field_names in PAYLOAD_FIELDS:
+        model = apps.get_model(app_label, model_name)
+        for name in field_names:
+            digests.update(
+                model.objects
+                .filter(**{f'{name}__has_key': REFERENCE_KEY})
+                .values_list(KeyTextTransform(REFERENCE_KEY, name), flat=True)
+                .iterator()
+            )
+    return digests
@@ -1,19 +1,29 @@
 from rest_framework import permissions
 
+
+def _organization_id(obj):
+    """Organization id of an object, following as few relations as possible"""
+    if hasattr(obj, 'organization_id'):
+        return obj.organization_id
+    if hasattr(obj, 'created_by'):
+        return obj.created_by.organization_id
+    if hasattr(obj, 'workflow'):
+        return _organization_id(obj.workflow)
+    if hasattr(obj, 'task'):
+        return _organization_id(obj.task)
+    return None
+
 class IsOrganizationMember(permissions.BasePermission):
     """
     Custom permission to only allow members of an organization to access its objects.
     """
     def has_permission(self, request, view):
-        return request.user and request.user.organization is not None
+        return request.user and request.user.organization_id is not None
 
     def has_object_permission(self, request, view, obj):
         # Check if user belongs to the same organization as the object
-        if hasattr(obj, 'created_by'):
-            return obj.created_by.organization == request.user.organization
-        elif hasattr(obj, 'organization'):
-            return obj.organization == request.user.organization
-        return False
+        organization_id = _organization_id(obj)
+        return organization_id is not None and organization_id == request.user.organization_id
 
 class IsOrganizationAdmin(permissions.BasePermission):
     """
@@ -28,5 +38,5 @@ class IsWorkflowOwnerOrAdmin(permissions.BasePermission):
     """
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
-            return obj.created_by.organization == request.user.organization
-        return obj.created_by == request.user or request.user.is_organization_admin 
\ No newline at end of file
+            return _organization_id(obj) == request.user.organization_id
+        return obj.created_by_id == request.user.id or request.user.is_organization_admin
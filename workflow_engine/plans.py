@@ -0,0 +1,207 @@
+"""
+Compiled execution plans.
+
+Building a plan queries the workflow's components and connections and
+validates the graph, including compiling the conditions of CONDITIONAL
+edges. Plans of published workflows are cached in-process,
+keyed by workflow id, version and ``updated_at``. Saving or deleting a
+component or connection touches ``Workflow.updated_at`` (see signals.py), so
+stale plans are never served, including by other worker processes.
+"""
+import hashlib
+import heapq
+import json
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .cache import LRUCache
+from .conditions import ConditionError, compile_condition
+
+
+class WorkflowValidationError(Exception):
+    """Raised when a workflow graph cannot be executed"""
+
+
+@dataclass(frozen=True)
+class Node:
+    id: int
+    ai_component_id: int
+    component_type: str
+    configuration: dict
+    order: int
+    cacheable: bool = False
+    timeout: float = None
+    max_retries: int = 0
+    retry_backoff: float = 0
+    idempotent: bool = False
+    ai_component_version: str = ''
+
+
+@dataclass(frozen=True)
+class Edge:
+    id: int
+    source: int
+    target: int
+    connection_type: str
+    condition: object = None
+    predicate: object = None
+
+
+def merge_configuration(schema, configuration):
+    """Overlay a component's configuration on the defaults of its schema"""
+    properties = schema.get('properties') if isinstance(schema, dict) else None
+    merged = {
+        key: prop['default']
+        for key, prop in (properties or {}).items()
+        if isinstance(prop, dict) and 'default' in prop
+    }
+    if isinstance(configuration, dict):
+        merged.update(configuration)
+    return merged
+
+
+def execution_policy(configuration):
+    """Timeout, retry settings and idempotency of a component, with the settings as defaults"""
+    idempotent = configuration.get('idempotent', False)
+    if not isinstance(idempotent, bool):
+        raise WorkflowValidationError("Invalid idempotent: expected a boolean")
+    policy = {
+        'timeout': configuration.get('timeout', settings.WORKFLOW_COMPONENT_TIMEOUT),
+        'max_retries': configuration.get('max_retries', settings.WORKFLOW_COMPONENT_MAX_RETRIES),
+        'retry_backoff': configuration.get('retry_backoff', settings.WORKFLOW_COMPONENT_RETRY_BACKOFF),
+    }
+    for key, value in policy.items():
+        valid_type = int if key == 'max_retries' else (int, float)
+        if isinstance(value, bool) or not isinstance(value, valid_type) or value < 0:
+            raise WorkflowValidationError(f"Invalid {key}: expected a non-negative number")
+    policy['timeout'] = policy['timeout'] or None
+    policy['idempotent'] = idempotent
+    return policy
+
+
+class WorkflowGraph:
+    """Validated, topologically ordered view of a workflow"""
+
+    def __init__(self, nodes, edges):
+        self.nodes = nodes
+        self.edges = edges
+        self.outgoing = {node_id: [] for node_id in nodes}
+        self.incoming = {node_id: [] for node_id in nodes}
+        for edge in edges:
+            self.outgoing[edge.source].append(edge)
+            self.incoming[edge.target].append(edge)
+        self.order = self._topological_order()
+        self.position = {node_id: index for index, node_id in enumerate(self.order)}
+        self.fingerprints = {node_id: self._fingerprint(node_id) for node_id in nodes}
+
+    @classmethod
+    def from_workflow(cls, workflow):
+        nodes = {}
+        for component in workflow.components.select_related('ai_component'):
+            configuration = merge_configuration(
+                component.ai_component.configuration_schema,
+                component.configuration
+            )
+            try:
+                policy = execution_policy(configuration)
+            except WorkflowValidationError as e:
+                raise WorkflowValidationError(f"Component {component.id}: {e}")
+            nodes[component.id] = Node(
+                id=component.id,
+                ai_component_id=component.ai_component_id,
+                component_type=component.ai_component.component_type,
+                configuration=configuration,
+                order=component.order,
+                cacheable=component.ai_component.is_cacheable,
+                ai_component_version=component.ai_component.updated_at.isoformat(),
+                **policy,
+            )
+        edges = []
+        for connection in workflow.connections.all():
+            if (connection.source_component_id not in nodes or
+                    connection.target_component_id not in nodes):
+                raise WorkflowValidationError(
+                    f"Connection {connection.id} references a component outside this workflow"
+                )
+            predicate = None
+            if connection.connection_type == 'CONDITIONAL':
+                try:
+                    predicate = compile_condition(connection.condition)
+                except ConditionError as e:
+                    raise WorkflowValidationError(
+                        f"Connection {connection.id} has an invalid condition: {e}"
+                    )
+            edges.append(Edge(
+                id=connection.id,
+                source=connection.source_component_id,
+                target=connection.target_component_id,
+                connection_type=connection.connection_type,
+                condition=connection.condition,
+                predicate=predicate,
+            ))
+        return cls(nodes, edges)
+
+    def _fingerprint(self, node_id):
+        """Hash of everything that determines what a node does with its inputs"""
+        node = self.nodes[node_id]
+        incoming = sorted(
+            (edge.source, edge.connection_type, edge.condition) for edge in self.incoming[node_id]
+        )
+        encoded = json.dumps(
+            [node.ai_component_id, node.ai_component_version, node.component_type,
+             node.configuration, incoming],
+            cls=DjangoJSONEncoder, sort_keys=True, separators=(',', ':')
+        )
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def _topological_order(self):
+        remaining = {node_id: len(edges) for node_id, edges in self.incoming.items()}
+        ready = [(node.order, node.id) for node in self.nodes.values() if not remaining[node.id]]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, node_id = heapq.heappop(ready)
+            order.append(node_id)
+            for edge in self.outgoing[node_id]:
+                remaining[edge.target] -= 1
+                if not remaining[edge.target]:
+                    heapq.heappush(ready, (self.nodes[edge.target].order, edge.target))
+        if len(order) != len(self.nodes):
+            raise WorkflowValidationError("Workflow contains a cycle")
+        return order
+
+    def roots(self):
+        return [node_id for node_id in self.order if not self.incoming[node_id]]
+
+    def sinks(self):
+        return [node_id for node_id in self.order if not self.outgoing[node_id]]
+
+
+_plans = LRUCache(maxsize=settings.WORKFLOW_PLAN_CACHE_SIZE)
+
+
+def _plan_key(workflow):
+    return (workflow.id, workflow.version, workflow.updated_at)
+
+
+def get_execution_plan(workflow):
+    """Return the validated graph for ``workflow``, compiling it if needed"""
+    if not workflow.is_published:
+        return WorkflowGraph.from_workflow(workflow)
+
+    key = _plan_key(workflow)
+    plan = _plans.get(key)
+    if plan is None:
+        plan = WorkflowGraph.from_workflow(workflow)
+        _plans.set(key, plan)
+    return plan
+
+
+def invalidate_plans(workflow_id=None):
+    """Drop cached plans for one workflow, or all of them"""
+    if workflow_id is None:
+        _plans.clear()
+    else:
+        _plans.discard(lambda key: key[0] == workflow_id)
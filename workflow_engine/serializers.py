@@ -1,10 +1,35 @@
+from django.db import models
 from rest_framework import serializers
 from .models import AIComponent, Workflow, WorkflowComponent, ComponentConnection, WorkflowExecution, ComponentExecutionLog
+from .conditions import ConditionError, compile_condition
+from .payloads import collect_references, load_many, resolve
+from .plans import WorkflowValidationError, execution_policy
+
+class PayloadField(serializers.JSONField):
+    """
+    JSON field that renders offloaded payload references as their value.
+    Payloads already loaded by the caller can be passed as the ``payloads``
+    serializer context.
+    """
+    def to_representation(self, value):
+        loaded = getattr(self.parent, '_payloads', None)
+        if loaded is None:
+            loaded = self.context.get('payloads')
+        return super().to_representation(resolve(value, loaded))
+
+class PayloadListSerializer(serializers.ListSerializer):
+    """Loads the payloads referenced by all listed objects with a single query"""
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        if 'payloads' not in self.context:
+            sources = [field.source for field in self.child.fields.values() if isinstance(field, PayloadField)]
+            self.child._payloads = load_many(collect_references(items, sources))
+        return super().to_representation(items)
 
 class AIComponentSerializer(serializers.ModelSerializer):
     class Meta:
         model = AIComponent
-        fields = ['id', 'name', 'description', 'component_type', 'configuration_schema', 'created_at', 'is_active']
+        fields = ['id', 'name', 'description', 'component_type', 'configuration_schema', 'created_at', 'is_active', 'is_cacheable']
         read_only_fields = ['created_at', 'created_by']
 
     def create(self, validated_data):
@@ -16,11 +41,29 @@ class WorkflowComponentSerializer(serializers.ModelSerializer):
         model = WorkflowComponent
         fields = ['id', 'workflow', 'ai_component', 'position_x', 'position_y', 'configuration', 'order']
 
+    def validate_configuration(self, value):
+        if isinstance(value, dict):
+            try:
+                execution_policy(value)
+            except WorkflowValidationError as e:
+                raise serializers.ValidationError(str(e))
+        return value
+
 class ComponentConnectionSerializer(serializers.ModelSerializer):
     class Meta:
         model = ComponentConnection
         fields = ['id', 'workflow', 'source_component', 'target_component', 'connection_type', 'condition']
 
+    def validate_condition(self, value):
+        try:
+            compile_condition(value)
+        except ConditionError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+class ConditionEvaluateSerializer(serializers.Serializer):
+    records = serializers.ListField(child=serializers.JSONField(), allow_empty=True)
+
 class WorkflowSerializer(serializers.ModelSerializer):
     components = WorkflowComponentSerializer(many=True, read_only=True)
     connections = ComponentConnectionSerializer(many=True, read_only=True)
@@ -35,13 +78,21 @@ class WorkflowSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 class WorkflowExecutionSerializer(serializers.ModelSerializer):
+    input_data = PayloadField()
+    output_data = PayloadField(read_only=True)
+
     class Meta:
         model = WorkflowExecution
-        fields = ['id', 'workflow', 'started_at', 'completed_at', 'status', 'input_data', 'output_data', 'error_message']
-        read_only_fields = ['started_at', 'completed_at', 'status', 'output_data', 'error_message']
+        list_serializer_class = PayloadListSerializer
+        fields = ['id', 'workflow', 'started_at', 'completed_at', 'status', 'input_data', 'output_data', 'error_message', 'resumed_from']
+        read_only_fields = ['started_at', 'completed_at', 'status', 'output_data', 'error_message', 'resumed_from']
 
 class ComponentExecutionLogSerializer(serializers.ModelSerializer):
+    input_data = PayloadField()
+    output_data = PayloadField(read_only=True)
+
     class Meta:
         model = ComponentExecutionLog
+        list_serializer_class = PayloadListSerializer
         fields = ['id', 'workflow_execution', 'workflow_component', 'started_at', 'completed_at', 'status', 'input_data', 'output_data', 'error_message']
         read_only_fields = ['started_at', 'completed_at', 'status', 'output_data', 'error_message'] 
\ No newline at end of file
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import AIComponent, ComponentConnection, Workflow, WorkflowComponent
+from .plans import invalidate_plans
+
+
+@receiver(post_save, sender=WorkflowComponent)
+@receiver(post_delete, sender=WorkflowComponent)
+@receiver(post_save, sender=ComponentConnection)
+@receiver(post_delete, sender=ComponentConnection)
+def invalidate_workflow_plan(sender, instance, **kwargs):
+    # Plans are cached under (id, version, updated_at), so other processes
+    # miss their stale plan once the workflow is touched
+    Workflow.objects.filter(pk=instance.workflow_id).update(updated_at=timezone.now())
+    invalidate_plans(instance.workflow_id)
+
+
+@receiver(post_delete, sender=Workflow)
+def discard_workflow_plan(sender, instance, **kwargs):
+    invalidate_plans(instance.id)
+
+
+@receiver(post_save, sender=AIComponent)
+def invalidate_component_plans(sender, instance, created, **kwargs):
+    if created:
+        return
+    Workflow.objects.filter(components__ai_component=instance).update(updated_at=timezone.now())
+    invalidate_plans()
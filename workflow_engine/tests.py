@@ -1,3 +1,999 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import requests
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APITestCase
+
+from accounts.authentication import CachedTokenAuthentication
+from accounts.models import CustomUser, InformaticaCredentials, Organization
+from informatica_services.job_logs import _store
+from informatica_services.models import (
+    ConnectorField, ConnectorType, DataTask, InformaticaConnection, JobLog, JobLogChunk, TaskExecution
+)
+from informatica_services.services import InformaticaAPIClient
+from informatica_services.session_tokens import get_session_token, invalidate_session_token
+from informatica_services.views import _parse_byte_range
+from .circuits import breaker
+from .components import register_handler
+from .conditions import ConditionError, compile_condition, evaluate_batch
+from .engine import WorkflowEngine, _GraphRun
+from .execution_queue import LEASE_EXPIRED_MESSAGE, claim_executions, fail_expired, release_executions
+from .memo import clear_results
+from .models import (
+    AIComponent, ComponentConnection, ComponentExecutionLog, Payload, Workflow, WorkflowComponent,
+    WorkflowExecution
+)
+from .payloads import load_many, offload, offload_many, resolve
+
+
+class ListQueryBudgetTests(APITestCase):
+    """
+    List endpoints must render any page with a fixed number of queries.
+    Each endpoint is requested with a small and a full page of rows; both
+    must stay within the budget and issue the same number of queries.
+    """
+    QUERY_BUDGET = 6
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Acme')
+        self.user = CustomUser.objects.create_user(
+            email='owner@example.com', username='owner', password='secret',
+            organization=self.organization
+        )
+        self.client.force_authenticate(self.user)
+        self.ai_component = AIComponent.objects.create(
+            name='Transform', description='', component_type='PROCESS',
+            configuration_schema={}, created_by=self.user
+        )
+        self.connector_type = ConnectorType.objects.create(
+            name='MySQL', code='mysql', informatica_type='MySQL', category='DATABASE'
+        )
+        ConnectorField.objects.create(
+            connector_type=self.connector_type, name='Host', field_key='host', field_type='STRING'
+        )
+
+    def create_rows(self, count):
+        for _ in range(count):
+            index = Workflow.objects.count()
+            workflow = Workflow.objects.create(
+                name=f'Workflow {index}', description='', created_by=self.user, version='1'
+            )
+            source, target = [
+                WorkflowComponent.objects.create(
+                    workflow=workflow, ai_component=self.ai_component,
+                    position_x=0, position_y=0, configuration={}, order=order
+                )
+                for order in range(2)
+            ]
+            ComponentConnection.objects.create(
+                workflow=workflow, source_component=source,
+                target_component=target, connection_type='SUCCESS'
+            )
+            WorkflowExecution.objects.create(workflow=workflow, status='COMPLETED', input_data={})
+
+            informatica_connection = InformaticaConnection.objects.create(
+                name=f'Connection {index}', connector_type=self.connector_type,
+                organization=self.organization, created_by=self.user, connection_config={}
+            )
+            task = DataTask.objects.create(
+                name=f'Task {index}', task_type='MAPPING', organization=self.organization,
+                created_by=self.user, source_connection=informatica_connection,
+                target_connection=informatica_connection, task_config={}
+            )
+            TaskExecution.objects.create(task=task, executed_by=self.user)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assertListWithinBudget(self, url):
+        self.create_rows(1)
+        small_page = self.count_queries(url)
+        self.create_rows(9)
+        full_page = self.count_queries(url)
+        self.assertLessEqual(full_page, self.QUERY_BUDGET)
+        self.assertEqual(small_page, full_page)
+
+    def test_workflows(self):
+        self.assertListWithinBudget('/api/workflows/workflows/')
+
+    def test_workflow_components(self):
+        self.assertListWithinBudget('/api/workflows/workflow-components/')
+
+    def test_component_connections(self):
+        self.assertListWithinBudget('/api/workflows/connections/')
+
+    def test_workflow_executions(self):
+        self.assertListWithinBudget('/api/workflows/executions/')
+
+    def test_informatica_connections(self):
+        self.assertListWithinBudget('/api/informatica/connections/')
+
+    def test_data_tasks(self):
+        self.assertListWithinBudget('/api/informatica/tasks/')
+
+    def test_task_executions(self):
+        self.assertListWithinBudget('/api/informatica/executions/')
+
+    def assertSummaryList(self, url):
+        self.assertListWithinBudget(url)
+        rows = self.client.get(url).data['results']
+        self.assertTrue(rows)
+        for row in rows:
+            self.assertFalse([value for value in row.values() if isinstance(value, (dict, list))])
+
+    def test_workflows_summary(self):
+        self.assertSummaryList('/api/workflows/workflows/?view=summary')
+
+    def test_workflow_executions_summary(self):
+        self.assertSummaryList('/api/workflows/executions/?view=summary')
+
+    def test_data_tasks_summary(self):
+        self.assertSummaryList('/api/informatica/tasks/?view=summary')
+
+    def test_task_executions_summary(self):
+        self.assertSummaryList('/api/informatica/executions/?view=summary')
+
+
+class ConditionTests(SimpleTestCase):
+    record = {
+        'status': 'ok',
+        'score': 0.7,
+        'retry': False,
+        'customer': {'country': 'DE', 'tags': ['vip', 'new']},
+        'in': 'field named like an operator',
+    }
+
+    def assertMatches(self, condition, expected=True):
+        self.assertIs(compile_condition(condition)(self.record), expected)
+
+    def test_null_and_empty_conditions_always_match(self):
+        self.assertMatches(None)
+        self.assertMatches({})
+
+    def test_falsy_literals_do_not_match(self):
+        self.assertMatches(False, False)
+        self.assertMatches(0, False)
+        self.assertMatches('', False)
+        self.assertMatches(True)
+
+    def test_var_lookup(self):
+        self.assertMatches({'==': [{'var': 'customer.country'}, 'DE']})
+        self.assertMatches({'==': [{'var': 'customer.tags.0'}, 'vip']})
+        self.assertMatches({'==': [{'var': 'customer.tags.-1'}, 'new']})
+        self.assertMatches({'==': [{'var': ['missing', 'fallback']}, 'fallback']})
+        self.assertMatches({'==': [{'var': 'customer.tags.5'}, None]})
+
+    def test_exists(self):
+        self.assertMatches({'exists': 'retry'})
+        self.assertMatches({'exists': 'customer.email'}, False)
+
+    def test_comparisons(self):
+        self.assertMatches({'>=': [{'var': 'score'}, 0.5]})
+        self.assertMatches({'<': [{'var': 'score'}, 0.5]}, False)
+        self.assertMatches({'!=': [{'var': 'status'}, 'failed']})
+        # Ordering between incompatible types never matches
+        self.assertMatches({'<': [{'var': 'status'}, 1]}, False)
+
+    def test_membership(self):
+        self.assertMatches({'in': [{'var': 'customer.country'}, ['DE', 'FR']]})
+        self.assertMatches({'not_in': [{'var': 'customer.country'}, ['DE', 'FR']]}, False)
+        self.assertMatches({'in': ['vip', {'var': 'customer.tags'}]})
+        self.assertMatches({'in': [{'var': 'customer'}, [{'country': 'DE'}]]}, False)
+
+    def test_boolean_operators(self):
+        self.assertMatches({'and': [{'exists': 'status'}, {'not': {'var': 'retry'}}]})
+        self.assertMatches({'or': [{'var': 'retry'}, {'==': [{'var': 'status'}, 'failed']}]}, False)
+        self.assertMatches({'not': [{'var': 'retry'}]})
+
+    def test_shorthand_equality(self):
+        self.assertMatches({'status': 'ok', 'retry': False})
+        self.assertMatches({'status': 'ok', 'retry': True}, False)
+        self.assertMatches({'customer.country': 'DE'})
+
+    def test_shorthand_with_operator_named_keys(self):
+        self.assertMatches({'in': 'field named like an operator', 'status': 'ok'})
+        self.assertMatches({'==': [{'var': 'in'}, 'field named like an operator']})
+
+    def test_malformed_conditions(self):
+        for condition in (
+            {'not': {'unknown': 1}},
+            {'==': [1]},
+            {'and': []},
+            {'not': [1, 2]},
+            {'var': 3},
+            {'in': 'DE'},
+            {'not': {'==': [1, 2], '!=': [1, 2]}},
+            {'==': [{'var': 'a', 'exists': 'b'}, 1]},
+            {'status': object()},
+        ):
+            with self.subTest(condition=condition), self.assertRaises(ConditionError):
+                compile_condition(condition)
+
+    def test_evaluate_batch(self):
+        records = [{'score': 0.2}, {'score': 0.9}, {}]
+        self.assertEqual(evaluate_batch({'>': [{'var': 'score'}, 0.5]}, records), [False, True, False])
+
+
+calls = []
+# Tags whose handler raises, for as many more calls as the value says
+failing = {}
+fan_out_barrier = threading.Barrier(2, timeout=5)
+
+
+@register_handler('test_tag')
+def tag_handler(input_data, configuration):
+    calls.append(configuration['tag'])
+    if failing.get(configuration['tag']):
+        failing[configuration['tag']] -= 1
+        raise RuntimeError('temporary failure')
+    output = dict(input_data) if isinstance(input_data, dict) else {'input': input_data}
+    output[configuration['tag']] = configuration.get('value', True)
+    return output
+
+
+@register_handler('test_fail')
+def fail_handler(input_data, configuration):
+    calls.append(configuration['tag'])
+    raise RuntimeError('boom')
+
+
+@register_handler('test_sleep')
+def sleep_handler(input_data, configuration):
+    calls.append(configuration['tag'])
+    time.sleep(configuration['seconds'])
+    return input_data
+
+
+@register_handler('test_mutate')
+def mutate_handler(input_data, configuration):
+    # Changes its input in place instead of building a new output
+    calls.append(configuration['tag'])
+    input_data['seen'] = configuration['tag']
+    return input_data
+
+
+@register_handler('test_count')
+def count_handler(input_data, configuration):
+    configuration['params']['count'] += 1
+    return {'count': configuration['params']['count']}
+
+
+@register_handler('test_barrier')
+def barrier_handler(input_data, configuration):
+    # Only returns once both siblings run at the same time
+    fan_out_barrier.wait()
+    return tag_handler(input_data, configuration)
+
+
+class EngineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        organization = Organization.objects.create(name='Acme')
+        cls.user = CustomUser.objects.create_user(
+            email='owner@example.com', username='owner', password='secret', organization=organization
+        )
+        cls.ai_component = AIComponent.objects.create(
+            name='Step', description='', component_type='PROCESS',
+            configuration_schema={}, created_by=cls.user
+        )
+
+    def setUp(self):
+        calls.clear()
+        failing.clear()
+        fan_out_barrier.reset()
+        clear_results()
+        breaker.reset()
+        self.workflow = Workflow.objects.create(name='Flow', description='', created_by=self.user, version='1')
+        self.components = {}
+
+    def add(self, tag, handler='test_tag', order=None, **configuration):
+        self.components[tag] = WorkflowComponent.objects.create(
+            workflow=self.workflow, ai_component=self.ai_component, position_x=0, position_y=0,
+            configuration={'handler': handler, 'tag': tag, **configuration},
+            order=len(self.components) if order is None else order
+        )
+
+    def connect(self, source, target, connection_type='SUCCESS', condition=None):
+        ComponentConnection.objects.create(
+            workflow=self.workflow, source_component=self.components[source],
+            target_component=self.components[target], connection_type=connection_type, condition=condition
+        )
+
+    def run_workflow(self, input_data=None, max_workers=None):
+        execution = WorkflowExecution.objects.create(
+            workflow=self.workflow, status='PENDING', input_data=input_data or {}
+        )
+        WorkflowEngine(max_workers=max_workers).run(execution)
+        execution.refresh_from_db()
+        return execution
+
+    def logs(self, execution):
+        return {
+            log.workflow_component.configuration['tag']: log
+            for log in ComponentExecutionLog.objects.filter(workflow_execution=execution)
+            .select_related('workflow_component')
+        }
+
+    def output(self, execution, tag):
+        return execution.output_data[str(self.components[tag].id)]
+
+    def test_runs_components_in_topological_order(self):
+        self.add('load', order=2)
+        self.add('transform', order=1)
+        self.add('store', order=0)
+        self.connect('load', 'transform')
+        self.connect('transform', 'store')
+        execution = self.run_workflow({'id': 1})
+        self.assertEqual(execution.status, 'COMPLETED')
+        self.assertEqual(calls, ['load', 'transform', 'store'])
+        self.assertEqual(self.output(execution, 'store'), {'id': 1, 'load': True, 'transform': True, 'store': True})
+        self.assertEqual({log.status for log in self.logs(execution).values()}, {'COMPLETED'})
+
+    def test_fans_out_in_parallel_and_merges_inputs(self):
+        self.add('split')
+        self.add('left', handler='test_barrier')
+        self.add('right', handler='test_barrier')
+        self.add('join')
+        for branch in ('left', 'right'):
+            self.connect('split', branch)
+            self.connect(branch, 'join')
+        execution = self.run_workflow(max_workers=2)
+        self.assertEqual(execution.status, 'COMPLETED')
+        self.assertEqual(self.output(execution, 'join'), {'split': True, 'left': True, 'right': True, 'join': True})
+
+    def test_handlers_cannot_change_inputs_shared_with_other_components(self):
+        self.add('split', handler='test_mutate')
+        self.add('left', handler='test_mutate')
+        self.add('right', handler='test_mutate')
+        self.connect('split', 'left')
+        self.connect('split', 'right')
+        execution = self.run_workflow({'id': 1}, max_workers=2)
+        self.assertEqual(execution.status, 'COMPLETED')
+        logs = self.logs(execution)
+        self.assertEqual(logs['split'].input_data, {'id': 1})
+        self.assertEqual(logs['split'].output_data, {'id': 1, 'seen': 'split'})
+        for branch in ('left', 'right'):
+            self.assertEqual(logs[branch].input_data, {'id': 1, 'seen': 'split'})
+            self.assertEqual(self.output(execution, branch), {'id': 1, 'seen': branch})
+        self.assertEqual(execution.input_data, {'id': 1})
+
+    def test_handlers_cannot_change_cached_plans(self):
+        self.workflow.is_published = True
+        self.workflow.save()
+        self.add('counter', handler='test_count', params={'count': 0})
+        counts = [self.output(self.run_workflow(), 'counter')['count'] for _ in range(3)]
+        self.assertEqual(counts, [1, 1, 1])
+
+    def test_conditional_edges_follow_the_matching_branch(self):
+        self.add('classify', value='ok')
+        self.add('accept')
+        self.add('reject')
+        self.connect('classify', 'accept', 'CONDITIONAL', {'classify': 'ok'})
+        self.connect('classify', 'reject', 'CONDITIONAL', {'classify': 'bad'})
+        execution = self.run_workflow()
+        self.assertEqual(execution.status, 'COMPLETED')
+        self.assertEqual(sorted(self.logs(execution)), ['accept', 'classify'])
+
+    def test_skips_everything_below_an_edge_that_did_not_fire(self):
+        self.add('source')
+        self.add('branch')
+        self.add('leaf')
+        self.add('other')
+        self.connect('source', 'branch', 'CONDITIONAL', False)
+        self.connect('branch', 'leaf')
+        self.connect('source', 'other')
+        execution = self.run_workflow()
+        self.assertEqual(execution.status, 'COMPLETED')
+        self.assertEqual(sorted(self.logs(execution)), ['other', 'source'])
+        self.assertEqual(list(execution.output_data), [str(self.components['other'].id)])
+
+    def test_failure_edges_handle_errors(self):
+        self.add('extract', handler='test_fail')
+        self.add('recover')
+        self.add('continue')
+        self.connect('extract', 'recover', 'FAILURE')
+        self.connect('extract', 'continue')
+        execution = self.run_workflow({'id': 1})
+        self.assertEqual(execution.status, 'COMPLETED')
+        logs = self.logs(execution)
+        self.assertEqual(sorted(logs), ['extract', 'recover'])
+        self.assertEqual(logs['extract'].status, 'FAILED')
+        self.assertEqual(logs['extract'].error_message, 'boom')
+        recovered = self.output(execution, 'recover')
+        self.assertEqual(recovered['error'], 'boom')
+        self.assertEqual(recovered['input'], {'id': 1})
+
+    def test_unhandled_failure_stops_scheduling(self):
+        self.add('broken', handler='test_fail')
+        self.add('first')
+        self.add('second')
+        self.connect('first', 'second')
+        execution = self.run_workflow(max_workers=1)
+        self.assertEqual(execution.status, 'FAILED')
+        self.assertIn('failed: boom', execution.error_message)
+        self.assertNotIn('second', calls)
+        self.assertNotIn('second', self.logs(execution))
+
+    @override_settings(WORKFLOW_LOG_FLUSH_SIZE=1000, WORKFLOW_LOG_FLUSH_INTERVAL=60)
+    def test_logs_are_flushed_when_the_run_raises(self):
+        self.add('first')
+        self.add('second')
+        self.connect('first', 'second')
+        with mock.patch.object(_GraphRun, '_resolve', side_effect=RuntimeError('scheduler crashed')):
+            execution = self.run_workflow()
+        self.assertEqual(execution.status, 'FAILED')
+        self.assertEqual(execution.error_message, 'scheduler crashed')
+        logs = self.logs(execution)
+        self.assertEqual(sorted(logs), ['first'])
+        self.assertEqual(logs['first'].status, 'COMPLETED')
+
+
+    def test_cacheable_components_reuse_outputs(self):
+        self.ai_component.is_cacheable = True
+        self.ai_component.save()
+        self.add('enrich')
+        first = self.run_workflow({'id': 1})
+        second = self.run_workflow({'id': 1})
+        other = self.run_workflow({'id': 2})
+        self.assertEqual(calls, ['enrich', 'enrich'])
+        self.assertEqual(self.output(second, 'enrich'), self.output(first, 'enrich'))
+        self.assertEqual(self.logs(second)['enrich'].status, 'COMPLETED')
+        self.assertEqual(self.output(other, 'enrich'), {'id': 2, 'enrich': True})
+
+    def test_cached_outputs_are_not_reused_once_the_ai_component_changed(self):
+        self.ai_component.is_cacheable = True
+        self.ai_component.save()
+        self.add('enrich')
+        self.run_workflow({'id': 1})
+        self.ai_component.description = 'Enriches records differently'
+        self.ai_component.save()
+        self.run_workflow({'id': 1})
+        self.assertEqual(calls, ['enrich', 'enrich'])
+
+    def resume(self, execution):
+        resumed = WorkflowExecution.objects.create(
+            workflow=self.workflow, status='PENDING', input_data=execution.input_data, resumed_from=execution
+        )
+        WorkflowEngine().run(resumed)
+        resumed.refresh_from_db()
+        return resumed
+
+    def build_pipeline(self):
+        for tag in ('extract', 'transform', 'load', 'audit'):
+            self.add(tag)
+        self.connect('extract', 'transform')
+        self.connect('transform', 'load')
+        self.connect('extract', 'audit')
+
+    def test_resume_reruns_only_the_failed_part(self):
+        self.build_pipeline()
+        failing['transform'] = 1
+        failed = self.run_workflow({'id': 1})
+        self.assertEqual(failed.status, 'FAILED')
+
+        calls.clear()
+        resumed = self.resume(failed)
+        self.assertEqual(resumed.status, 'COMPLETED')
+        self.assertEqual(calls, ['transform', 'load'])
+        self.assertEqual(sorted(self.logs(resumed)), ['audit', 'extract', 'load', 'transform'])
+        self.assertEqual(
+            self.output(resumed, 'load'), {'id': 1, 'extract': True, 'transform': True, 'load': True}
+        )
+
+    def test_resume_reruns_components_changed_since(self):
+        self.build_pipeline()
+        failing['load'] = 1
+        failed = self.run_workflow({'id': 1})
+
+        extract = self.components['extract']
+        extract.configuration = {**extract.configuration, 'value': 'fixed'}
+        extract.save()
+        calls.clear()
+        resumed = self.resume(failed)
+        self.assertEqual(resumed.status, 'COMPLETED')
+        self.assertEqual(sorted(calls), ['audit', 'extract', 'load', 'transform'])
+        self.assertEqual(self.output(resumed, 'load')['extract'], 'fixed')
+
+    def test_resume_endpoint_only_accepts_failed_executions(self):
+        self.build_pipeline()
+        failing['transform'] = 1
+        failed = self.run_workflow()
+        completed = self.run_workflow()
+        self.client.force_login(self.user)
+        response = self.client.post(f'/api/workflows/executions/{failed.id}/resume/')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['resumed_from'], failed.id)
+        self.assertEqual(response.json()['status'], 'PENDING')
+        response = self.client.post(f'/api/workflows/executions/{completed.id}/resume/')
+        self.assertEqual(response.status_code, 400)
+
+    def test_evaluate_endpoint_rejects_invalid_stored_conditions(self):
+        self.add('source')
+        self.add('target')
+        self.connect('source', 'target', 'CONDITIONAL', {'>': [{'var': 'score'}, 0.5]})
+        valid = ComponentConnection.objects.get()
+        # Saved directly, as conditions were before they were validated
+        invalid = ComponentConnection.objects.create(
+            workflow=self.workflow, source_component=self.components['target'],
+            target_component=self.components['source'], connection_type='CONDITIONAL', condition={'in': 5}
+        )
+        self.client.force_login(self.user)
+        records = {'records': [{'score': 0.7}, {'score': 0.2}]}
+        response = self.client.post(
+            f'/api/workflows/connections/{valid.id}/evaluate/', records, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'results': [True, False]})
+        response = self.client.post(
+            f'/api/workflows/connections/{invalid.id}/evaluate/', records, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('takes exactly two arguments', response.json()['error'])
+
+    def test_failures_are_retried(self):
+        self.add('call', max_retries=2, retry_backoff=0)
+        failing['call'] = 2
+        execution = self.run_workflow()
+        self.assertEqual(execution.status, 'COMPLETED')
+        self.assertEqual(calls, ['call'] * 3)
+
+    def test_retries_are_bounded(self):
+        self.add('call', max_retries=1, retry_backoff=0)
+        failing['call'] = 2
+        execution = self.run_workflow()
+        self.assertEqual(execution.status, 'FAILED')
+        self.assertIn('temporary failure', execution.error_message)
+        self.assertEqual(calls, ['call'] * 2)
+
+    def test_timeouts_are_only_retried_when_idempotent(self):
+        self.add('slow', handler='test_sleep', seconds=0.2, timeout=0.02, max_retries=1, retry_backoff=0)
+        self.add('idempotent', handler='test_sleep', seconds=0.2, timeout=0.02, max_retries=1,
+                 retry_backoff=0, idempotent=True)
+        execution = self.run_workflow()
+        self.assertEqual(execution.status, 'FAILED')
+        self.assertIn('Timed out after 0.02s', execution.error_message)
+        self.assertEqual(sorted(calls), ['idempotent', 'idempotent', 'slow'])
+
+    def test_circuit_opens_after_repeated_failures(self):
+        self.add('flaky')
+        failing['flaky'] = 10
+        with mock.patch.object(breaker, 'failure_threshold', 2):
+            for _ in range(3):
+                execution = self.run_workflow()
+            self.assertIn('failed repeatedly and is paused', execution.error_message)
+            self.assertEqual(calls, ['flaky', 'flaky'])
+
+            # Updating the AI component closes its circuit
+            self.ai_component.save()
+            failing.clear()
+            self.assertEqual(self.run_workflow().status, 'COMPLETED')
+
+    def test_outcome_is_discarded_once_the_lease_expired(self):
+        self.add('step')
+        execution = WorkflowExecution.objects.create(workflow=self.workflow, status='PENDING', input_data={})
+
+        def expire(run):
+            WorkflowExecution.objects.filter(pk=execution.pk).update(
+                status='FAILED', error_message=LEASE_EXPIRED_MESSAGE
+            )
+            return {}, []
+
+        with mock.patch.object(_GraphRun, 'execute', autospec=True, side_effect=expire):
+            WorkflowEngine().run(execution)
+        self.assertEqual(execution.status, 'FAILED')
+        execution.refresh_from_db()
+        self.assertEqual(execution.status, 'FAILED')
+        self.assertEqual(execution.error_message, LEASE_EXPIRED_MESSAGE)
+
+
+class ExecutionQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = CustomUser.objects.create_user(email='owner@example.com', username='owner', password='secret')
+        cls.workflow = Workflow.objects.create(name='Flow', description='', created_by=user, version='1')
+
+    def create(self, count, status='PENDING', **fields):
+        return [
+            WorkflowExecution.objects.create(workflow=self.workflow, status=status, input_data={}, **fields)
+            for _ in range(count)
+        ]
+
+    def statuses(self, executions):
+        return [WorkflowExecution.objects.get(pk=execution.pk).status for execution in executions]
+
+    def test_claims_pending_executions_once(self):
+        pending = self.create(3)
+        self.create(1, status='COMPLETED')
+        first = claim_executions(2)
+        second = claim_executions(2)
+        self.assertEqual([execution.pk for execution in first], [execution.pk for execution in pending[:2]])
+        self.assertEqual([execution.pk for execution in second], [pending[2].pk])
+        self.assertEqual(claim_executions(2), [])
+        self.assertEqual(self.statuses(pending), ['RUNNING'] * 3)
+        self.assertFalse(WorkflowExecution.objects.filter(status='RUNNING', heartbeat_at__isnull=True).exists())
+
+    def test_releases_claimed_executions(self):
+        self.create(2)
+        claimed = claim_executions(2)
+        release_executions(claimed[1:])
+        self.assertEqual(self.statuses(claimed), ['RUNNING', 'PENDING'])
+        self.assertIsNone(WorkflowExecution.objects.get(pk=claimed[1].pk).heartbeat_at)
+        self.assertEqual([execution.pk for execution in claim_executions(2)], [claimed[1].pk])
+
+    @override_settings(WORKFLOW_LEASE_TIMEOUT=60)
+    def test_fails_executions_whose_lease_expired(self):
+        now = timezone.now()
+        stale = self.create(1, status='RUNNING', heartbeat_at=now - timedelta(seconds=120))
+        unleased = self.create(1, status='RUNNING')
+        live = self.create(1, status='RUNNING', heartbeat_at=now)
+        pending = self.create(1)
+        self.assertEqual(fail_expired(), 2)
+        self.assertEqual(self.statuses(stale + unleased + live + pending), ['FAILED', 'FAILED', 'RUNNING', 'PENDING'])
+        failed = WorkflowExecution.objects.get(pk=stale[0].pk)
+        self.assertEqual(failed.error_message, LEASE_EXPIRED_MESSAGE)
+        self.assertIsNotNone(failed.completed_at)
+
+
+@override_settings(PAYLOAD_INLINE_THRESHOLD=64)
+class PayloadTests(APITestCase):
+    large = {'rows': ['x' * 10] * 10}
+
+    @classmethod
+    def setUpTestData(cls):
+        organization = Organization.objects.create(name='Acme')
+        cls.user = CustomUser.objects.create_user(
+            email='owner@example.com', username='owner', password='secret', organization=organization
+        )
+        cls.workflow = Workflow.objects.create(name='Flow', description='', created_by=cls.user, version='1')
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_large_values_are_stored_once(self):
+        first, second, small = offload_many([self.large, self.large, {'id': 1}])
+        self.assertEqual(first, second)
+        self.assertEqual(set(first), {'$payload', 'size'})
+        self.assertEqual(small, {'id': 1})
+        self.assertEqual(Payload.objects.count(), 1)
+        self.assertEqual(resolve(first), self.large)
+
+    def test_lookalike_values_are_not_references(self):
+        reference = offload(self.large)
+        for value in (reference, {'$payload': 'hello', 'other': 1}, {'$inline': 3}):
+            with self.subTest(value=value):
+                stored = offload(value)
+                self.assertNotEqual(stored, reference)
+                self.assertEqual(resolve(stored), value)
+
+    def test_request_data_cannot_reference_stored_payloads(self):
+        forged = offload(self.large)
+        response = self.client.post(f'/api/workflows/workflows/{self.workflow.id}/execute/', forged, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['input_data'], forged)
+
+    def test_loaded_values_are_private_copies(self):
+        digest = offload(self.large)['$payload']
+        load_many([digest])[digest]['rows'].clear()
+        self.assertEqual(load_many([digest])[digest], self.large)
+
+    def test_export_loads_payloads_once_per_chunk(self):
+        def export_queries(count):
+            for index in range(count):
+                execution = WorkflowExecution.objects.create(
+                    workflow=self.workflow, status='COMPLETED', input_data=offload({**self.large, 'index': index})
+                )
+                ComponentExecutionLog.objects.create(
+                    workflow_execution=execution, workflow_component=component, status='COMPLETED',
+                    input_data=execution.input_data, output_data=offload({**self.large, 'log': index})
+                )
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/workflows/executions/export/')
+                records = b''.join(response.streaming_content).splitlines()
+            self.assertEqual(len(records), WorkflowExecution.objects.count())
+            return len(queries)
+
+        ai_component = AIComponent.objects.create(
+            name='Step', description='', component_type='PROCESS', configuration_schema={}, created_by=self.user
+        )
+        component = WorkflowComponent.objects.create(
+            workflow=self.workflow, ai_component=ai_component, position_x=0, position_y=0,
+            configuration={}, order=0
+        )
+        self.assertEqual(export_queries(2), export_queries(20))
+
+
+def fake_response(status_code, body=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode() if body is not None else b''
+    return response
+
+
+class SessionTokenTests(SimpleTestCase):
+    base_url = 'https://pod.example.com'
+
+    def setUp(self):
+        cache.clear()
+        self.logins = []
+
+    def login(self):
+        self.logins.append(threading.current_thread().name)
+        time.sleep(0.05)
+        return {'session_id': f'S{len(self.logins)}', 'expires_at': time.time() + 3600}
+
+    def get(self, security_domain=None):
+        return get_session_token(self.base_url, 'user', 'secret', self.login, security_domain=security_domain)
+
+    def test_concurrent_callers_share_one_login(self):
+        sessions = []
+        threads = [threading.Thread(target=lambda: sessions.append(self.get())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.logins), 1)
+        self.assertEqual({session['session_id'] for session in sessions}, {'S1'})
+
+    def test_sessions_are_kept_per_security_domain(self):
+        self.assertEqual(self.get()['session_id'], 'S1')
+        self.assertEqual(self.get('corp')['session_id'], 'S2')
+        self.assertEqual(self.get('corp')['session_id'], 'S2')
+        self.assertEqual(len(self.logins), 2)
+
+    def test_invalidation_keeps_a_session_refreshed_meanwhile(self):
+        self.get()
+        invalidate_session_token(self.base_url, 'user', 'secret', session_id='S0')
+        self.assertEqual(self.get()['session_id'], 'S1')
+        invalidate_session_token(self.base_url, 'user', 'secret', session_id='S1')
+        self.assertEqual(self.get()['session_id'], 'S2')
+
+    def test_expired_sessions_are_not_cached(self):
+        with mock.patch.object(self, 'login', return_value={'session_id': 'S', 'expires_at': time.time()}):
+            self.get()
+            self.get()
+            self.assertEqual(self.login.call_count, 2)
+
+
+class SessionClientTests(SimpleTestCase):
+    base_url = 'https://pod.example.com'
+
+    def setUp(self):
+        cache.clear()
+        self.api = InformaticaAPIClient(self.base_url, 'user', 'secret')
+        self.logins = 0
+        self.rejected = set()
+
+    def request(self, method, url, **kwargs):
+        if url.endswith('/user/login'):
+            self.logins += 1
+            return fake_response(200, {'sessionId': f'S{self.logins}'})
+        session_id = kwargs['headers']['INFA-SESSION-ID']
+        if session_id in self.rejected:
+            return fake_response(401)
+        return fake_response(200, {'session': session_id})
+
+    def call(self):
+        with mock.patch.object(self.api.session, 'request', side_effect=self.request):
+            return self.api.get_connection_details('C1')
+
+    def test_reuses_the_cached_session(self):
+        self.assertEqual(self.call(), {'session': 'S1'})
+        self.assertEqual(self.call(), {'session': 'S1'})
+        self.assertEqual(self.logins, 1)
+
+    def test_logs_in_again_once_after_a_401(self):
+        self.call()
+        self.rejected.add('S1')
+        self.assertEqual(self.call(), {'session': 'S2'})
+        self.assertEqual(self.logins, 2)
+
+    def test_gives_up_when_the_new_session_is_rejected_too(self):
+        self.rejected.update({'S1', 'S2'})
+        with self.assertRaises(requests.HTTPError):
+            self.call()
+        self.assertEqual(self.logins, 2)
+
+
+class ByteRangeTests(SimpleTestCase):
+    def test_valid_ranges(self):
+        for header, expected in (
+            ('bytes=0-9', (0, 10)),
+            ('bytes=90-', (90, 100)),
+            ('bytes=-10', (90, 100)),
+            ('bytes=95-200', (95, 100)),
+            ('bytes=-500', (0, 100)),
+        ):
+            with self.subTest(header=header):
+                self.assertEqual(_parse_byte_range(header, 100), expected)
+
+    def test_unsatisfiable_ranges(self):
+        for header in ('bytes=100-', 'bytes=5-2', 'lines=0-1', 'bytes=0-1,3-4', 'bytes=a-b', 'bytes=-0'):
+            with self.subTest(header=header), self.assertRaises(ValueError):
+                _parse_byte_range(header, 100)
+
+
+@override_settings(INFORMATICA_LOG_REFRESH_INTERVAL=0, INFORMATICA_LOG_CHUNK_SIZE=4)
+class JobLogTests(APITestCase):
+    def setUp(self):
+        organization = Organization.objects.create(name='Acme')
+        user = CustomUser.objects.create_user(
+            email='owner@example.com', username='owner', password='secret', organization=organization
+        )
+        self.client.force_authenticate(user)
+        connector_type = ConnectorType.objects.create(
+            name='MySQL', code='mysql', informatica_type='MySQL', category='DATABASE'
+        )
+        informatica_connection = InformaticaConnection.objects.create(
+            name='Warehouse', connector_type=connector_type, organization=organization,
+            created_by=user, connection_config={}
+        )
+        task = DataTask.objects.create(
+            name='Load', task_type='MAPPING', organization=organization, created_by=user,
+            source_connection=informatica_connection, target_connection=informatica_connection, task_config={}
+        )
+        self.execution = TaskExecution.objects.create(
+            task=task, executed_by=user, status='RUNNING', informatica_job_id='J1'
+        )
+        self.remote = b'line one\n'
+        self.fetched = []
+
+        def get_job_log_content(client, job_id, offset=0):
+            self.fetched.append(offset)
+            return self.remote[offset:]
+
+        patcher = mock.patch.object(InformaticaAPIClient, 'get_job_log_content', get_job_log_content)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, **headers):
+        response = self.client.get(f'/api/informatica/executions/{self.execution.id}/logs/', **headers)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, content
+
+    def test_fetches_only_bytes_not_stored_yet(self):
+        response, content = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(content, b'line one\n')
+        self.remote += b'line two\n'
+        response, content = self.get()
+        self.assertEqual(content, b'line one\nline two\n')
+        self.assertEqual(response['X-Log-Size'], '18')
+        self.assertEqual(self.fetched, [0, 9])
+        self.assertEqual(
+            list(JobLogChunk.objects.values_list('offset', 'size')),
+            [(0, 4), (4, 4), (8, 1), (9, 4), (13, 4), (17, 1)]
+        )
+
+    def test_stops_fetching_once_the_job_finished(self):
+        self.execution.status = 'COMPLETED'
+        self.execution.save()
+        response, _ = self.get()
+        self.assertEqual(response['X-Log-Complete'], 'true')
+        self.get()
+        self.assertEqual(self.fetched, [0])
+
+    def test_serves_byte_ranges(self):
+        self.remote = b'0123456789'
+        response, content = self.get(HTTP_RANGE='bytes=3-6')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(content, b'3456')
+        self.assertEqual(response['Content-Range'], 'bytes 3-6/10')
+        self.assertEqual(response['Content-Length'], '4')
+        response, content = self.get(HTTP_RANGE='bytes=-2')
+        self.assertEqual((response.status_code, content), (206, b'89'))
+        response, _ = self.get(HTTP_RANGE='bytes=10-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_store_skips_data_another_request_stored(self):
+        log = JobLog.objects.create(execution=self.execution)
+        self.assertTrue(_store(log, 0, b'abc'))
+        self.assertFalse(_store(log, 0, b'abc'))
+        log.refresh_from_db()
+        self.assertEqual(log.size, 3)
+        self.assertEqual(JobLogChunk.objects.count(), 1)
+
+
+class BulkConnectionTests(APITestCase):
+    url = '/api/informatica/connections/bulk_create/'
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Acme')
+        user = CustomUser.objects.create_user(
+            email='owner@example.com', username='owner', password='secret', organization=self.organization
+        )
+        self.client.force_authenticate(user)
+        self.connector_type = ConnectorType.objects.create(
+            name='MySQL', code='mysql', informatica_type='MySQL', category='DATABASE'
+        )
+        self.provisioned = []
+
+        def create_connection(client, data):
+            if data['name'] == 'broken':
+                raise RuntimeError('rejected by Informatica')
+            self.provisioned.append((client.base_url, client.username, data['name']))
+            return {'id': f"remote-{data['name']}"}
+
+        patcher = mock.patch.object(InformaticaAPIClient, 'create_connection', create_connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def item(self, name):
+        return {
+            'name': name, 'connector_type': self.connector_type.id,
+            'organization': self.organization.id, 'connection_config': {}
+        }
+
+    def test_requires_credentials(self):
+        response = self.client.post(self.url, [self.item('warehouse')], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(InformaticaConnection.objects.exists())
+
+    def test_provisions_connections_and_reports_failures(self):
+        InformaticaCredentials.objects.create(
+            username='integration', password='secret', pod_url='https://pod.example.com/'
+        )
+        response = self.client.post(
+            self.url, {'connections': [self.item('warehouse'), self.item('broken')]}, format='json'
+        )
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data['created'], response.data['failed']), (1, 1))
+        self.assertEqual(response.data['results'][1]['error'], 'rejected by Informatica')
+        self.assertEqual(self.provisioned, [('https://pod.example.com', 'integration', 'warehouse')])
+        self.assertEqual(
+            list(InformaticaConnection.objects.values_list('name', 'informatica_connection_id')),
+            [('warehouse', 'remote-warehouse')]
+        )
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organization = Organization.objects.create(name='Acme')
+        self.user = CustomUser.objects.create_user(
+            email='owner@example.com', username='owner', password='secret', organization=self.organization
+        )
+        self.key = Token.objects.create(user=self.user).key
+        self.authentication = CachedTokenAuthentication()
+
+    def authenticate(self):
+        return self.authentication.authenticate_credentials(self.key)[0]
+
+    def test_cached_users_are_authenticated_without_queries(self):
+        self.authenticate()
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertEqual((user.pk, user.organization_id), (self.user.pk, self.organization.pk))
+        self.assertNotIn('password', user.__dict__)
+
+    def test_deleted_tokens_are_rejected(self):
+        self.authenticate()
+        # What logging out does
+        Token.objects.get(key=self.key).delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_saving_the_user_drops_the_cached_entry(self):
+        self.authenticate()
+        other = Organization.objects.create(name='Other')
+        self.user.organization = other
+        self.user.save()
+        self.assertEqual(self.authenticate().organization_id, other.pk)
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
@@ -0,0 +1,85 @@
+"""
+Component handlers run under a timeout.
+
+Handlers with a timeout run on a pool of reusable daemon threads while the
+engine worker waits for them. Threads cannot be killed, so a handler that
+times out is abandoned: it keeps its thread until it returns on its own, and
+its result is discarded. At most WORKFLOW_MAX_ABANDONED_HANDLERS handlers may
+be abandoned per process; beyond that, components with a timeout fail
+without being started until some of them have returned.
+"""
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError
+
+from django.conf import settings
+from django.db import connections
+
+
+class ComponentTimeoutError(Exception):
+    """Raised when a component handler runs longer than its timeout"""
+
+
+class TooManyAbandonedError(Exception):
+    """Raised instead of starting a handler while too many timed out ones are still running"""
+
+
+class _HandlerThreads:
+    """Daemon threads that are reused between handler calls"""
+
+    def __init__(self, max_abandoned):
+        self.max_abandoned = max_abandoned
+        self.abandoned = 0
+        self._idle = 0
+        self._tasks = queue.SimpleQueue()
+        self._lock = threading.Lock()
+
+    def _work(self):
+        while True:
+            future, func, args = self._tasks.get()
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args))
+                except Exception as e:
+                    future.set_exception(e)
+                finally:
+                    # Handlers may touch the database from this thread
+                    connections.close_all()
+            with self._lock:
+                if getattr(future, 'abandoned', False):
+                    self.abandoned -= 1
+                self._idle += 1
+
+    def call(self, timeout, func, *args):
+        future = Future()
+        with self._lock:
+            if self.abandoned >= self.max_abandoned:
+                raise TooManyAbandonedError(
+                    f"{self.abandoned} timed out component handlers are still running"
+                )
+            if self._idle:
+                self._idle -= 1
+            else:
+                threading.Thread(target=self._work, name='workflow-handler', daemon=True).start()
+        self._tasks.put((future, func, args))
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            with self._lock:
+                # The handler may have finished in the meantime
+                if not future.done():
+                    future.abandoned = True
+                    self.abandoned += 1
+            if future.cancel() or getattr(future, 'abandoned', False):
+                raise ComponentTimeoutError(f"Timed out after {timeout:g}s")
+            return future.result()
+
+
+_threads = _HandlerThreads(settings.WORKFLOW_MAX_ABANDONED_HANDLERS)
+
+
+def call_with_timeout(timeout, func, *args):
+    """Return ``func(*args)``, raising ComponentTimeoutError after ``timeout`` seconds"""
+    if not timeout:
+        return func(*args)
+    return _threads.call(timeout, func, *args)
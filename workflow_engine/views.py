@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.shortcuts import render
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import (
@@ -10,28 +12,35 @@ from .models import (
 from .serializers import (
     AIComponentSerializer, WorkflowSerializer, WorkflowComponentSerializer,
     ComponentConnectionSerializer, WorkflowExecutionSerializer,
-    ComponentExecutionLogSerializer
+    ComponentExecutionLogSerializer, ConditionEvaluateSerializer
 )
 from .permissions import IsOrganizationMember, IsOrganizationAdmin, IsWorkflowOwnerOrAdmin
+from .mixins import EagerLoadingMixin, SummaryListMixin
+from .pagination import ExecutionCursorPagination
+from .conditions import ConditionError, evaluate_batch
+from .ndjson import NDJSONParser, chunks, parse_lines, streaming_response
+from .payloads import collect_references, load_many, offload, offload_many
 
 # Create your views here.
 
-class AIComponentViewSet(viewsets.ModelViewSet):
+class AIComponentViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     serializer_class = AIComponentSerializer
     permission_classes = [IsAuthenticated, IsOrganizationMember]
 
     def get_queryset(self):
         return AIComponent.objects.filter(
-            created_by__organization=self.request.user.organization
+            organization_id=self.request.user.organization_id
         )
 
-class WorkflowViewSet(viewsets.ModelViewSet):
+class WorkflowViewSet(SummaryListMixin, EagerLoadingMixin, viewsets.ModelViewSet):
     serializer_class = WorkflowSerializer
     permission_classes = [IsAuthenticated, IsOrganizationMember, IsWorkflowOwnerOrAdmin]
+    summary_fields = ('id', 'name', 'description', 'created_by', 'created_at', 'updated_at',
+                      'is_active', 'is_published', 'version')
 
     def get_queryset(self):
         return Workflow.objects.filter(
-            created_by__organization=self.request.user.organization
+            organization_id=self.request.user.organization_id
         )
 
     @action(detail=True, methods=['post'])
@@ -57,37 +66,133 @@ class WorkflowViewSet(viewsets.ModelViewSet):
         workflow = self.get_object()
         serializer = WorkflowExecutionSerializer(data={'workflow': workflow.id, 'input_data': request.data})
         if serializer.is_valid():
-            execution = serializer.save()
-            # Here you would typically trigger the workflow execution in background
-            # For now, we'll just mark it as completed
-            execution.status = 'COMPLETED'
-            execution.save()
-            return Response(WorkflowExecutionSerializer(execution).data)
+            # Queued for the run_workflow_worker command
+            execution = serializer.save(
+                status='PENDING', input_data=offload(serializer.validated_data['input_data'])
+            )
+            return Response(WorkflowExecutionSerializer(execution).data, status=status.HTTP_202_ACCEPTED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class WorkflowComponentViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=['post'], parser_classes=[JSONParser, NDJSONParser, MultiPartParser])
+    def execute_batch(self, request, pk=None):
+        """
+        Queue one execution per input payload. Accepts a JSON array, an
+        ``{"inputs": [...]}`` object, an NDJSON body or an NDJSON ``file`` upload.
+        """
+        workflow = self.get_object()
+        if 'file' in request.FILES:
+            inputs = parse_lines(request.FILES['file'])
+        elif isinstance(request.data, dict):
+            inputs = request.data.get('inputs')
+        else:
+            inputs = request.data
+
+        if not isinstance(inputs, list) or not inputs:
+            return Response(
+                {'error': 'Expected a non-empty list of input payloads'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(inputs) > settings.WORKFLOW_BATCH_MAX_INPUTS:
+            return Response(
+                {'error': f'A batch may contain at most {settings.WORKFLOW_BATCH_MAX_INPUTS} inputs'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        executions = WorkflowExecution.objects.bulk_create(
+            [
+                WorkflowExecution(
+                    workflow=workflow, organization_id=workflow.organization_id,
+                    status='PENDING', input_data=input_data
+                )
+                for input_data in offload_many(inputs)
+            ],
+            batch_size=1000
+        )
+        return Response({
+            'count': len(executions),
+            'execution_ids': [execution.id for execution in executions]
+        }, status=status.HTTP_202_ACCEPTED)
+
+class WorkflowComponentViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     serializer_class = WorkflowComponentSerializer
     permission_classes = [IsAuthenticated, IsOrganizationMember]
 
     def get_queryset(self):
         return WorkflowComponent.objects.filter(
-            workflow__created_by__organization=self.request.user.organization
+            organization_id=self.request.user.organization_id
         )
 
-class ComponentConnectionViewSet(viewsets.ModelViewSet):
+class ComponentConnectionViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     serializer_class = ComponentConnectionSerializer
     permission_classes = [IsAuthenticated, IsOrganizationMember]
 
     def get_queryset(self):
         return ComponentConnection.objects.filter(
-            workflow__created_by__organization=self.request.user.organization
+            organization_id=self.request.user.organization_id
         )
 
-class WorkflowExecutionViewSet(viewsets.ReadOnlyModelViewSet):
+    @action(detail=True, methods=['post'])
+    def evaluate(self, request, pk=None):
+        """Evaluate the connection's condition against a batch of records"""
+        connection = self.get_object()
+        serializer = ConditionEvaluateSerializer(data=request.data)
+        if serializer.is_valid():
+            try:
+                results = evaluate_batch(connection.condition, serializer.validated_data['records'])
+            except ConditionError as e:
+                # Conditions saved before they were validated may not compile
+                return Response({'error': f'Invalid condition: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({'results': results})
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+class WorkflowExecutionViewSet(SummaryListMixin, EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = WorkflowExecutionSerializer
     permission_classes = [IsAuthenticated, IsOrganizationMember]
+    summary_fields = ('id', 'workflow', 'started_at', 'completed_at', 'status', 'error_message', 'resumed_from')
+    pagination_class = ExecutionCursorPagination
 
     def get_queryset(self):
         return WorkflowExecution.objects.filter(
-            workflow__created_by__organization=self.request.user.organization
+            organization_id=self.request.user.organization_id
+        )
+
+    @action(detail=True, methods=['post'])
+    def resume(self, request, pk=None):
+        """
+        Queue a new execution of a failed one that reuses the outputs of its
+        completed components and only re-runs the failed part of the graph
+        """
+        execution = self.get_object()
+        if execution.status != 'FAILED':
+            return Response(
+                {'error': 'Only failed executions can be resumed'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        resumed = WorkflowExecution.objects.create(
+            workflow_id=execution.workflow_id, organization_id=execution.organization_id,
+            status='PENDING', input_data=execution.input_data, resumed_from=execution
         )
+        return Response(WorkflowExecutionSerializer(resumed).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream every execution with its component logs as NDJSON"""
+        queryset = self.get_queryset().order_by('id').prefetch_related('component_logs')
+        chunk_size = settings.EXPORT_CHUNK_SIZE
+
+        def records():
+            for chunk in chunks(queryset.iterator(chunk_size=chunk_size), chunk_size):
+                # One payload query per chunk of executions and their logs
+                logs = [log for execution in chunk for log in execution.component_logs.all()]
+                fields = ('input_data', 'output_data')
+                context = {'payloads': load_many(
+                    collect_references(chunk, fields) + collect_references(logs, fields)
+                )}
+                for execution in chunk:
+                    record = WorkflowExecutionSerializer(execution, context=context).data
+                    record['component_logs'] = ComponentExecutionLogSerializer(
+                        execution.component_logs.all(), many=True, context=context
+                    ).data
+                    yield record
+
+        return streaming_response(records(), 'workflow-executions.ndjson')